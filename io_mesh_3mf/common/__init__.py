@@ -19,7 +19,7 @@ Re-exports the most frequently used symbols for convenient access::
 """
 
 # Logging
-from .logging import DEBUG_MODE, debug, warn, error, safe_report
+from .logging import DEBUG_MODE, debug, debug_enabled, warn, error, safe_report
 
 # Color helpers
 from .colors import (
@@ -56,6 +56,7 @@ __all__ = [
     # Logging
     "DEBUG_MODE",
     "debug",
+    "debug_enabled",
     "warn",
     "error",
     "safe_report",
@@ -24,7 +24,7 @@ Usage::
     error(f"Failed to write: {e}")       # Always prints  ERROR: ...
 """
 
-__all__ = ["DEBUG_MODE", "debug", "warn", "error", "safe_report", "timing_debug"]
+__all__ = ["DEBUG_MODE", "debug", "debug_enabled", "warn", "error", "safe_report", "timing_debug"]
 
 
 DEBUG_MODE = False
@@ -40,9 +40,23 @@ def _is_blender_debug() -> bool:
         return False
 
 
+def debug_enabled() -> bool:
+    """Return True if :func:`debug` output is currently enabled.
+
+    Use this to skip building expensive debug messages (f-strings in hot
+    loops) when they would be discarded anyway::
+
+        verbose = debug_enabled()
+        for item in items:
+            if verbose:
+                debug(f"Item {item.name}: {item.props}")
+    """
+    return DEBUG_MODE or _is_blender_debug()
+
+
 def debug(*args, **kwargs):
     """Print to console only when DEBUG_MODE is enabled or Blender is in --debug mode."""
-    if DEBUG_MODE or _is_blender_debug():
+    if debug_enabled():
         print(*args, **kwargs)
 
 
@@ -59,7 +73,7 @@ def timing_debug(label: str, elapsed_ms: float) -> None:
         [3MF TIMING] write_vertices SubElement loop (50000 verts): 45.1ms
         [3MF TIMING] write_vertices TOTAL (50000 verts): 58.3ms
     """
-    if DEBUG_MODE or _is_blender_debug():
+    if debug_enabled():
         print(f"[3MF TIMING] {label}: {elapsed_ms:.2f}ms")
 
 
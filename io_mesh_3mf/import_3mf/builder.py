@@ -226,7 +226,7 @@ def build_object(
                 # Defer: collect all solid-paint parts so they can share one texture.
                 ctx.pending_solid_paint_parts.append((mesh, extruder_1based))
             else:
-                _apply_extruder_material(mesh, extruder_1based, hex_color)
+                _apply_extruder_material(ctx, mesh, extruder_1based, hex_color)
 
         # Stash per-part slicer setting overrides for round-trip export.
         if subtype_key and subtype_key in ctx.part_metadata:
@@ -400,7 +400,9 @@ def _build_mesh(
     return mesh
 
 
-def _apply_extruder_material(mesh: bpy.types.Mesh, extruder_1based: int, hex_color: str) -> None:
+def _apply_extruder_material(
+    ctx: "ImportContext", mesh: bpy.types.Mesh, extruder_1based: int, hex_color: str
+) -> None:
     """Create or reuse a simple solid-color material for a per-part extruder assignment.
 
     Used for Orca/FullSpectrum files that assign filament via ``extruder=`` metadata in
@@ -408,11 +410,13 @@ def _apply_extruder_material(mesh: bpy.types.Mesh, extruder_1based: int, hex_col
     segmentation strings.  The material is named ``3MF_Extruder_N`` so it is shared across
     parts that use the same extruder.
 
+    :param ctx: Import context, whose material reuse index learns the new material.
     :param mesh: Blender mesh data to append the material to.
     :param extruder_1based: 1-based extruder index.
     :param hex_color: Hex color string (``#RRGGBB``).
     """
     import bpy as _bpy
+    from .materials import index_material_color
     mat_name = f"3MF_Extruder_{extruder_1based}"
     mat = _bpy.data.materials.get(mat_name)
     if mat is None:
@@ -436,6 +440,7 @@ def _apply_extruder_material(mesh: bpy.types.Mesh, extruder_1based: int, hex_col
         bsdf.inputs["Base Color"].default_value = (r, g, b, 1.0)
         mat.diffuse_color = (r, g, b, 1.0)
         debug(f"Created material {mat_name!r} for extruder {extruder_1based} ({hex_color})")
+        index_material_color(ctx, mat)
     mesh.materials.append(mat)
 
 
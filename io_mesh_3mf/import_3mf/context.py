@@ -94,6 +94,13 @@ class ImportContext:
     resource_pbr_display_props: Dict[str, ResourcePBRDisplayProps] = field(default_factory=dict)
     object_passthrough_pids: Dict[str, str] = field(default_factory=dict)
 
+    # --- Material reuse index -----------------------------------------------
+    # Snapshot of node-based materials (name → quantized RGBA) and its reverse
+    # index, built lazily by find_existing_material and extended as new
+    # materials are created.
+    material_colors: Optional[Dict[str, Tuple[int, ...]]] = None
+    material_color_index: Optional[Dict[Tuple[int, ...], str]] = None
+
     # --- Component instance cache (for linked-duplicate detection) ----------
     component_instance_cache: Dict[str, Tuple[object, int]] = field(default_factory=dict)
 
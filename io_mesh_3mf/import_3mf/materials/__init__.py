@@ -24,6 +24,7 @@ This package handles importing material-related elements from 3MF files:
 from .base import (
     read_materials,
     find_existing_material,
+    index_material_color,
     parse_hex_color,
     srgb_to_linear,
 )
@@ -53,6 +54,7 @@ __all__ = [
     # base
     "read_materials",
     "find_existing_material",
+    "index_material_color",
     "parse_hex_color",
     "srgb_to_linear",
     # textures
@@ -19,17 +19,39 @@ This module handles:
 - Material reuse and finding existing materials
 """
 
-from typing import Tuple, Optional, TYPE_CHECKING
+from typing import Dict, List, Tuple, Optional, TYPE_CHECKING
 
 import bpy
-import bpy_extras.node_shader_utils
+import numpy as np
 
-from ...common import debug, warn
+from ...common import debug, debug_enabled, warn
+from ...common.constants import MAX_MATERIAL_GROUP_SIZE, MODEL_NAMESPACES
+from ...common.types import ResourceColorgroup, ResourceMaterial
 
 if TYPE_CHECKING:
     pass  # Import3MF will be in import_3mf.operator once created
 
 
+# ResourceMaterial fields populated from parsed PBR display properties.
+_PBR_KEYS = ("metallic", "roughness", "specular_color", "glossiness", "ior", "attenuation", "transmission")
+_EMPTY_PBR = dict.fromkeys(_PBR_KEYS)
+
+
+def _pbr_kwargs(pbr_data: dict) -> dict:
+    """
+    Select the ResourceMaterial PBR keyword arguments from a display properties dict.
+
+    Display property dicts also carry keys like ``name`` that must not be
+    forwarded, so they cannot be splatted directly.
+
+    :param pbr_data: Parsed PBR properties for one material (may be empty).
+    :return: Keyword arguments for the PBR fields of ``ResourceMaterial``.
+    """
+    if not pbr_data:
+        return _EMPTY_PBR
+    return {key: pbr_data.get(key) for key in _PBR_KEYS}
+
+
 def srgb_to_linear(value: float) -> float:
     """
     Convert sRGB color component to linear color space.
@@ -78,6 +100,95 @@ def parse_hex_color(hex_color: str) -> Tuple[float, float, float, float]:
     return (0.8, 0.8, 0.8, 1.0)  # Default gray
 
 
+def _material_color(material: bpy.types.Material) -> Tuple[float, float, float, float]:
+    """Read the Principled BSDF base color and alpha of a node-based material."""
+    from bpy_extras.node_shader_utils import PrincipledBSDFWrapper
+
+    principled = PrincipledBSDFWrapper(material, is_readonly=True)
+    # Index the Color directly rather than unpacking it through the iterator protocol
+    base_color = principled.base_color
+    return (base_color[0], base_color[1], base_color[2], principled.alpha)
+
+
+def _color_key(color) -> Tuple[int, ...]:
+    """
+    Quantize an RGBA color into a hashable key for material reuse lookups.
+
+    Each channel is mapped to a 10-bit integer, so one step (1/1024) matches
+    the 0.001 tolerance previously used for fuzzy float comparison.
+    """
+    return tuple(min(1023, int(c * 1024)) for c in color)
+
+
+def _snapshot_material_colors() -> Dict[str, Tuple[int, ...]]:
+    """
+    Read the color of every node-based material in the blend file once.
+
+    Constructing a ``PrincipledBSDFWrapper`` walks the material's node tree, so
+    doing it for every material on every lookup is O(N·M) for an import that
+    creates N materials against M existing ones.
+
+    :return: Mapping of material name to quantized RGBA key.
+    """
+    return {mat.name: _color_key(_material_color(mat)) for mat in bpy.data.materials if mat.use_nodes}
+
+
+def _ensure_material_snapshot(op) -> None:
+    """Build this import's material color snapshot and reverse index on first use."""
+    if op.material_color_index is None:
+        op.material_colors = _snapshot_material_colors()
+        color_index = {}
+        for mat_name, key in op.material_colors.items():
+            color_index.setdefault(key, mat_name)
+        op.material_color_index = color_index
+
+
+def index_material_color(op, material: bpy.types.Material) -> None:
+    """
+    Register a material created during this import with the reuse index.
+
+    Keeps ``find_existing_material`` able to reuse materials created earlier in
+    the same import run without re-scanning ``bpy.data.materials``.  Callers
+    that create solid-color materials (per-triangle and per-extruder ones) must
+    register them here; MMU paint texture materials are left out on purpose,
+    since their Principled base color does not describe how they look.
+
+    :param op: The import context holding the index.
+    :param material: The newly created material.
+    """
+    if op.material_color_index is not None and material.use_nodes:
+        key = _color_key(_material_color(material))
+        op.material_colors[material.name] = key
+        op.material_color_index.setdefault(key, material.name)
+
+
+# Below this many colors, per-color decoding is cheaper than NumPy's per-call overhead.
+_BATCH_DECODE_MIN_COLORS = 32
+
+
+def _decode_hex_colors(hex_colors: List[str]) -> Optional[List[Tuple[float, float, float, float]]]:
+    """
+    Decode many sRGB hex colors to linear RGBA in a single vectorized pass.
+
+    :param hex_colors: 6- or 8-digit hex strings without the leading ``#``.
+    :return: Linear RGBA tuples in input order, or None if any string is not
+        valid hex (the caller then falls back to per-color decoding).
+    """
+    try:
+        data = bytes.fromhex("".join(h if len(h) == 8 else h + "FF" for h in hex_colors))
+    except ValueError:
+        return None
+    # bytes.fromhex() skips whitespace, which would misalign the channels
+    if len(data) != 4 * len(hex_colors):
+        return None
+
+    rgba = np.frombuffer(data, dtype=np.uint8).reshape(-1, 4) / 255
+    rgb = rgba[:, :3]
+    # Alpha is linear and is NOT converted
+    rgba[:, :3] = np.where(rgb <= 0.04045, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+    return [tuple(row) for row in rgba.tolist()]
+
+
 def find_existing_material(
     op, name: str, color: Tuple[float, float, float, float]
 ) -> Optional[bpy.types.Material]:
@@ -89,27 +200,25 @@ def find_existing_material(
     :param color: The RGBA color tuple (values 0-1).
     :return: Matching material if found, None otherwise.
     """
-    # First try exact name match
-    if name in bpy.data.materials:
-        material = bpy.data.materials[name]
-        if material.use_nodes:
-            principled = bpy_extras.node_shader_utils.PrincipledBSDFWrapper(material, is_readonly=True)
-            # Check if colors match (within small tolerance for float comparison)
-            existing_color = (*principled.base_color, principled.alpha)
-            if all(abs(existing_color[i] - color[i]) < 0.001 for i in range(4)):
-                debug(f"Reusing existing material: {name}")
-                return material
+    _ensure_material_snapshot(op)
+    target_key = _color_key(color)
+
+    # First try exact name match.  The snapshot only holds node-based
+    # materials, and quantized keys absorb the float tolerance.
+    if op.material_colors.get(name) == target_key:
+        material = bpy.data.materials.get(name)
+        if material is not None:
+            debug(f"Reusing existing material: {name}")
+            return material
 
     # Try to find any material with matching color (fuzzy name match)
-    color_tolerance = 0.001
-    for mat in bpy.data.materials:
-        if mat.use_nodes:
-            principled = bpy_extras.node_shader_utils.PrincipledBSDFWrapper(mat, is_readonly=True)
-            existing_color = (*principled.base_color, principled.alpha)
-            if all(abs(existing_color[i] - color[i]) < color_tolerance for i in range(4)):
-                # Found a material with matching color but different name
-                debug(f"Reusing material '{mat.name}' for color match (requested name: '{name}')")
-                return mat
+    candidate_name = op.material_color_index.get(target_key)
+    if candidate_name is not None:
+        mat = bpy.data.materials.get(candidate_name)
+        if mat is not None:
+            # Found a material with matching color but different name
+            debug(f"Reusing material '{mat.name}' for color match (requested name: '{name}')")
+            return mat
 
     return None
 
@@ -125,8 +234,8 @@ def read_materials(op, root, material_ns: dict, display_properties: dict) -> Non
     :param material_ns: Namespace dict for materials extension.
     :param display_properties: Parsed PBR display properties lookup.
     """
-    from ...common.constants import MODEL_NAMESPACES
-    from ...common.types import ResourceMaterial
+    # Per-material debug messages are only formatted when they will be printed
+    verbose = debug_enabled()
 
     # Import core spec basematerials
     for basematerials_item in root.iterfind("./3mf:resources/3mf:basematerials", MODEL_NAMESPACES):
@@ -147,8 +256,8 @@ def read_materials(op, root, material_ns: dict, display_properties: dict) -> Non
 
         # Check group size before parsing — reject absurdly large groups
         # (e.g. 3D scans with per-vertex coloring)
-        from ...common.constants import MAX_MATERIAL_GROUP_SIZE
-        child_count = len(basematerials_item.findall("./3mf:base", MODEL_NAMESPACES))
+        base_items = basematerials_item.findall("./3mf:base", MODEL_NAMESPACES)
+        child_count = len(base_items)
         if child_count > MAX_MATERIAL_GROUP_SIZE:
             msg = (
                 f"Basematerials group {material_id} has {child_count:,} entries — "
@@ -163,7 +272,7 @@ def read_materials(op, root, material_ns: dict, display_properties: dict) -> Non
         op.resource_materials[material_id] = {}
         index = 0
 
-        for base_item in basematerials_item.iterfind("./3mf:base", MODEL_NAMESPACES):
+        for base_item in base_items:
             name = base_item.attrib.get("name", "3MF Material")
             color = base_item.attrib.get("displaycolor")
 
@@ -185,7 +294,8 @@ def read_materials(op, root, material_ns: dict, display_properties: dict) -> Non
                 # If no scalar data found, check for textured PBR properties
                 if not pbr_data and display_props_id in op.resource_pbr_texture_displays:
                     textured_pbr = op.resource_pbr_texture_displays[display_props_id]
-                    debug(f"Material '{name}' has textured PBR: {textured_pbr.type}")
+                    if verbose:
+                        debug(f"Material '{name}' has textured PBR: {textured_pbr.type}")
             elif group_pbr_props_list:
                 pbr_data = group_pbr_props_list[index] if index < len(group_pbr_props_list) else {}
 
@@ -256,13 +366,7 @@ def read_materials(op, root, material_ns: dict, display_properties: dict) -> Non
             op.resource_materials[material_id][index] = ResourceMaterial(
                 name=name,
                 color=color,
-                metallic=pbr_data.get("metallic"),
-                roughness=pbr_data.get("roughness"),
-                specular_color=pbr_data.get("specular_color"),
-                glossiness=pbr_data.get("glossiness"),
-                ior=pbr_data.get("ior"),
-                attenuation=pbr_data.get("attenuation"),
-                transmission=pbr_data.get("transmission"),
+                **_pbr_kwargs(pbr_data),
                 metallic_texid=metallic_texid,
                 roughness_texid=roughness_texid,
                 specular_texid=specular_texid,
@@ -270,9 +374,9 @@ def read_materials(op, root, material_ns: dict, display_properties: dict) -> Non
                 basecolor_texid=basecolor_texid,
             )
 
-            if pbr_data:
+            if verbose and pbr_data:
                 debug(f"Material '{name}' has PBR properties: {pbr_data}")
-            if textured_pbr:
+            if verbose and textured_pbr:
                 debug(
                     f"Material '{name}' has textured PBR: metallic_tex={metallic_texid}, "
                     f"roughness_tex={roughness_texid}, basecolor_tex={basecolor_texid}"
@@ -296,10 +400,13 @@ def _read_colorgroups(op, root, material_ns: dict, display_properties: dict) ->
     :param material_ns: Namespace dict for materials extension.
     :param display_properties: Parsed PBR display properties lookup.
     """
-    from ...common.constants import MODEL_NAMESPACES
-    from ...common.types import ResourceMaterial, ResourceColorgroup
+    # Without the Materials extension prefix there is nothing to match
+    if not material_ns.get("m"):
+        return
 
-    for colorgroup_item in root.iterfind("./3mf:resources/m:colorgroup", {**MODEL_NAMESPACES, **material_ns}):
+    namespaces = {**MODEL_NAMESPACES, **material_ns}
+
+    for colorgroup_item in root.iterfind("./3mf:resources/m:colorgroup", namespaces):
         try:
             colorgroup_id = colorgroup_item.attrib["id"]
         except KeyError:
@@ -317,8 +424,8 @@ def _read_colorgroups(op, root, material_ns: dict, display_properties: dict) ->
 
         # Check group size before parsing — reject absurdly large groups
         # (e.g. 3D scans with per-vertex coloring)
-        from ...common.constants import MAX_MATERIAL_GROUP_SIZE
-        child_count = len(colorgroup_item.findall("./m:color", material_ns))
+        color_items = colorgroup_item.findall("./m:color", material_ns)
+        child_count = len(color_items)
         if child_count > MAX_MATERIAL_GROUP_SIZE:
             msg = (
                 f"Colorgroup {colorgroup_id} has {child_count:,} entries — "
@@ -331,55 +438,98 @@ def _read_colorgroups(op, root, material_ns: dict, display_properties: dict) ->
             continue
 
         raw_colors = []
+        append_raw = raw_colors.append
         op.resource_materials[colorgroup_id] = {}
         index = 0
 
-        for color_item in colorgroup_item.iterfind("./m:color", material_ns):
-            color = color_item.attrib.get("color")
-            if color is not None:
-                raw_color = color if color.startswith("#") else f"#{color}"
-                raw_colors.append(raw_color)
+        if not pbr_props_list:
+            # Fast path for the common case — plain slicer color zones without
+            # display properties need no per-color PBR lookup.
+            hex_colors = []
+            for color_item in color_items:
+                color = color_item.attrib.get("color")
+                if color is None:
+                    continue
+                append_raw(color if color.startswith("#") else f"#{color}")
 
                 color = color.lstrip("#")
-                try:
-                    if len(color) == 6:
-                        red = srgb_to_linear(int(color[0:2], 16) / 255)
-                        green = srgb_to_linear(int(color[2:4], 16) / 255)
-                        blue = srgb_to_linear(int(color[4:6], 16) / 255)
-                        alpha = 1.0
-                    elif len(color) == 8:
-                        red = srgb_to_linear(int(color[0:2], 16) / 255)
-                        green = srgb_to_linear(int(color[2:4], 16) / 255)
-                        blue = srgb_to_linear(int(color[4:6], 16) / 255)
-                        alpha = int(color[6:8], 16) / 255  # Alpha is linear
-                    else:
+                if len(color) != 6 and len(color) != 8:
+                    warn(f"Invalid color for colorgroup {colorgroup_id}: #{color}")
+                    op.safe_report({"WARNING"}, f"Invalid color: #{color}")
+                    continue
+                hex_colors.append(color)
+
+            linear_colors = None
+            if len(hex_colors) >= _BATCH_DECODE_MIN_COLORS:
+                linear_colors = _decode_hex_colors(hex_colors)
+            if linear_colors is None:
+                linear_colors = []
+                for color in hex_colors:
+                    try:
+                        channels = bytes.fromhex(color)
+                    except ValueError as e:
+                        warn(f"Invalid color for colorgroup {colorgroup_id}: {e}")
+                        continue
+                    if len(channels) != len(color) // 2:
+                        # fromhex skips whitespace, so "ff ff " decodes short.
                         warn(f"Invalid color for colorgroup {colorgroup_id}: #{color}")
                         op.safe_report({"WARNING"}, f"Invalid color: #{color}")
                         continue
+                    linear_colors.append((
+                        srgb_to_linear(channels[0] / 255),
+                        srgb_to_linear(channels[1] / 255),
+                        srgb_to_linear(channels[2] / 255),
+                        channels[3] / 255 if len(channels) == 4 else 1.0,  # Alpha is linear
+                    ))
+
+            for mat_color in linear_colors:
+                op.resource_materials[colorgroup_id][index] = ResourceMaterial(
+                    name=f"Orca Color {index}",
+                    color=mat_color,
+                    **_EMPTY_PBR,
+                )
+                index += 1
+        else:
+            for color_item in color_items:
+                color = color_item.attrib.get("color")
+                if color is not None:
+                    raw_color = color if color.startswith("#") else f"#{color}"
+                    append_raw(raw_color)
+
+                    color = color.lstrip("#")
+                    try:
+                        if len(color) == 6:
+                            red = srgb_to_linear(int(color[0:2], 16) / 255)
+                            green = srgb_to_linear(int(color[2:4], 16) / 255)
+                            blue = srgb_to_linear(int(color[4:6], 16) / 255)
+                            alpha = 1.0
+                        elif len(color) == 8:
+                            red = srgb_to_linear(int(color[0:2], 16) / 255)
+                            green = srgb_to_linear(int(color[2:4], 16) / 255)
+                            blue = srgb_to_linear(int(color[4:6], 16) / 255)
+                            alpha = int(color[6:8], 16) / 255  # Alpha is linear
+                        else:
+                            warn(f"Invalid color for colorgroup {colorgroup_id}: #{color}")
+                            op.safe_report({"WARNING"}, f"Invalid color: #{color}")
+                            continue
+
+                        pbr_data = pbr_props_list[index] if index < len(pbr_props_list) else {}
+
+                        mat_color = (red, green, blue, alpha)
+                        op.resource_materials[colorgroup_id][index] = ResourceMaterial(
+                            name=f"Orca Color {index}",
+                            color=mat_color,
+                            **_pbr_kwargs(pbr_data),
+                            metallic_texid=None,
+                            roughness_texid=None,
+                            specular_texid=None,
+                            glossiness_texid=None,
+                        )
+                        index += 1
 
-                    pbr_data = pbr_props_list[index] if index < len(pbr_props_list) else {}
-
-                    mat_color = (red, green, blue, alpha)
-                    op.resource_materials[colorgroup_id][index] = ResourceMaterial(
-                        name=f"Orca Color {index}",
-                        color=mat_color,
-                        metallic=pbr_data.get("metallic"),
-                        roughness=pbr_data.get("roughness"),
-                        specular_color=pbr_data.get("specular_color"),
-                        glossiness=pbr_data.get("glossiness"),
-                        ior=pbr_data.get("ior"),
-                        attenuation=pbr_data.get("attenuation"),
-                        transmission=pbr_data.get("transmission"),
-                        metallic_texid=None,
-                        roughness_texid=None,
-                        specular_texid=None,
-                        glossiness_texid=None,
-                    )
-                    index += 1
-
-                except (ValueError, KeyError) as e:
-                    warn(f"Invalid color for colorgroup {colorgroup_id}: {e}")
-                    continue
+                    except (ValueError, KeyError) as e:
+                        warn(f"Invalid color for colorgroup {colorgroup_id}: {e}")
+                        continue
 
         if raw_colors:
             op.resource_colorgroups[colorgroup_id] = ResourceColorgroup(
@@ -649,6 +649,7 @@ def assign_materials_to_mesh(
     """
     from .materials import (
         find_existing_material,
+        index_material_color,
         apply_pbr_to_principled,
         apply_pbr_textures_to_material,
         setup_textured_material,
@@ -714,6 +715,8 @@ def assign_materials_to_mesh(
                         apply_pbr_to_principled(ctx, principled, material, triangle_material)
                         apply_pbr_textures_to_material(ctx, material, triangle_material)
 
+                    index_material_color(ctx, material)
+
                 ctx.resource_to_material[triangle_material] = material
 
                 # Cache textured material under original basematerial key
@@ -22,115 +22,94 @@ Submodules:
 - ``bake``              — Bake-to-MMU operators and Shader Editor panel
 """
 
-from . import helpers        # noqa: F401
-from . import properties     # noqa: F401
-from . import quantize       # noqa: F401
-from . import vertex_colors  # noqa: F401
-from . import operators      # noqa: F401
-from . import mmu_panel      # noqa: F401
-from . import bake           # noqa: F401
+import importlib
 
-# Re-export key helpers used by other packages (bake, import, export).
+# Public names re-exported from submodules, resolved on first access (PEP 562)
+# so importing the add-on does not load the whole paint subsystem up front.
 # These maintain backward-compatible import paths for external consumers.
-from .helpers import (  # noqa: F401
-    DEFAULT_PALETTE,
-    _get_paint_image,
-    _get_paint_mesh,
-    _sync_filaments_from_mesh,
-    _configure_paint_brush,
-    _set_brush_color,
-    _write_colors_to_mesh,
-)
+_LAZY_EXPORTS = {
+    # Key helpers used by other packages (bake, import, export)
+    "DEFAULT_PALETTE": ".helpers",
+    "_get_paint_image": ".helpers",
+    "_get_paint_mesh": ".helpers",
+    "_sync_filaments_from_mesh": ".helpers",
+    "_configure_paint_brush": ".helpers",
+    "_set_brush_color": ".helpers",
+    "_write_colors_to_mesh": ".helpers",
+    # PropertyGroups
+    "MMUMixedFilamentItem": ".properties",
+    "MMUFilamentItem": ".properties",
+    "MMUInitFilamentItem": ".properties",
+    "MMUPaintSettings": ".properties",
+    # Operators
+    "MMU_OT_initialize": ".operators",
+    "MMU_OT_add_init_filament": ".operators",
+    "MMU_OT_remove_init_filament": ".operators",
+    "MMU_OT_reset_init_filaments": ".operators",
+    "MMU_OT_detect_material_colors": ".operators",
+    "MMU_OT_select_filament": ".operators",
+    "MMU_OT_reassign_filament_color": ".operators",
+    "MMU_OT_add_filament": ".operators",
+    "MMU_OT_remove_filament": ".operators",
+    "MMU_OT_fix_falloff": ".operators",
+    "MMU_OT_switch_to_paint": ".operators",
+    "MMU_OT_import_paint_popup": ".operators",
+    "MMU_OT_init_auxiliary_paint": ".operators",
+    "MMU_OT_switch_paint_layer": ".operators",
+    "MMU_OT_switch_aux_brush": ".operators",
+    "MMU_OT_add_mixed_filament": ".operators",
+    "MMU_OT_remove_mixed_filament": ".operators",
+    "MMU_OT_recompute_mix_color": ".operators",
+    "MMU_MT_add_mix_menu": ".operators",
+    "MMU_OT_add_mix_gradient": ".operators",
+    "MMU_OT_add_mix_pattern": ".operators",
+    "MMU_OT_add_mix_by_color": ".operators",
+    "MMU_OT_add_mix_confirm": ".operators",
+    "MMU_OT_cancel_add_mix": ".operators",
+    # Panels, UILists and the depsgraph handler
+    "MMU_UL_init_filaments": ".mmu_panel",
+    "MMU_UL_filaments": ".mmu_panel",
+    "MMU_UL_mixed_filaments": ".mmu_panel",
+    "VIEW3D_PT_mmu_paint": ".mmu_panel",
+    "VIEW3D_PT_mmu_mix_colors": ".mmu_panel",
+    "_on_depsgraph_update": ".mmu_panel",
+}
 
-import bpy
+_SUBMODULES = frozenset((
+    "helpers",
+    "properties",
+    "color_detection",
+    "quantize",
+    "vertex_colors",
+    "operators",
+    "mmu_panel",
+    "bake",
+))
 
-from .properties import MMUMixedFilamentItem, MMUFilamentItem, MMUInitFilamentItem, MMUPaintSettings
-from .operators import (
-    MMU_OT_initialize,
-    MMU_OT_add_init_filament,
-    MMU_OT_remove_init_filament,
-    MMU_OT_reset_init_filaments,
-    MMU_OT_detect_material_colors,
-    MMU_OT_select_filament,
-    MMU_OT_reassign_filament_color,
-    MMU_OT_add_filament,
-    MMU_OT_remove_filament,
-    MMU_OT_fix_falloff,
-    MMU_OT_switch_to_paint,
-    MMU_OT_import_paint_popup,
-    MMU_OT_init_auxiliary_paint,
-    MMU_OT_switch_paint_layer,
-    MMU_OT_switch_aux_brush,
-    MMU_OT_add_mixed_filament,
-    MMU_OT_remove_mixed_filament,
-    MMU_OT_recompute_mix_color,
-    MMU_MT_add_mix_menu,
-    MMU_OT_add_mix_gradient,
-    MMU_OT_add_mix_pattern,
-    MMU_OT_add_mix_by_color,
-    MMU_OT_add_mix_confirm,
-    MMU_OT_cancel_add_mix,
-)
-from .mmu_panel import (
-    MMU_UL_init_filaments,
-    MMU_UL_filaments,
-    MMU_UL_mixed_filaments,
-    VIEW3D_PT_mmu_paint,
-    VIEW3D_PT_mmu_mix_colors,
-    _on_depsgraph_update,
-)
 
-
-# All classes to register, in dependency order (PropertyGroups first).
-_paint_classes = (
-    MMUMixedFilamentItem,
-    MMUFilamentItem,
-    MMUInitFilamentItem,
-    MMUPaintSettings,
-    MMU_OT_initialize,
-    MMU_OT_add_init_filament,
-    MMU_OT_remove_init_filament,
-    MMU_OT_reset_init_filaments,
-    MMU_OT_detect_material_colors,
-    MMU_OT_select_filament,
-    MMU_OT_reassign_filament_color,
-    MMU_OT_add_filament,
-    MMU_OT_remove_filament,
-    MMU_OT_fix_falloff,
-    MMU_OT_switch_to_paint,
-    MMU_OT_import_paint_popup,
-    MMU_OT_init_auxiliary_paint,
-    MMU_OT_switch_paint_layer,
-    MMU_OT_switch_aux_brush,
-    MMU_OT_add_mixed_filament,
-    MMU_OT_remove_mixed_filament,
-    MMU_OT_recompute_mix_color,
-    MMU_MT_add_mix_menu,
-    MMU_OT_add_mix_gradient,
-    MMU_OT_add_mix_pattern,
-    MMU_OT_add_mix_by_color,
-    MMU_OT_add_mix_confirm,
-    MMU_OT_cancel_add_mix,
-    MMU_UL_init_filaments,
-    MMU_UL_filaments,
-    MMU_UL_mixed_filaments,
-    VIEW3D_PT_mmu_paint,
-    VIEW3D_PT_mmu_mix_colors,
-)
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is not None:
+        return getattr(importlib.import_module(module_name, __name__), name)
+    if name in _SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def register():
-    for cls in _paint_classes:
-        bpy.utils.register_class(cls)
-    bpy.types.Scene.mmu_paint = bpy.props.PointerProperty(type=MMUPaintSettings)
-    bpy.app.handlers.depsgraph_update_post.append(_on_depsgraph_update)
+    # Dependency order: PropertyGroups first, panels/UILists last.
+    from . import properties, operators, mmu_panel, bake
+
+    properties.register()
+    operators.register()
+    mmu_panel.register()
     bake.register()
 
 
 def unregister():
+    from . import properties, operators, mmu_panel, bake
+
     bake.unregister()
-    if _on_depsgraph_update in bpy.app.handlers.depsgraph_update_post:
-        bpy.app.handlers.depsgraph_update_post.remove(_on_depsgraph_update)
-    del bpy.types.Scene.mmu_paint
-    for cls in reversed(_paint_classes):
-        bpy.utils.unregister_class(cls)
+    mmu_panel.unregister()
+    operators.unregister()
+    properties.unregister()
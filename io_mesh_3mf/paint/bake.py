@@ -57,6 +57,7 @@ from .quantize import (  # noqa: F401 â€” re-exported for backward compat
     _quantize_by_regions,
     _apply_majority_filter,
 )
+from .mmu_panel import _invalidate_panel_state
 from .vertex_colors import (  # noqa: F401 â€” re-exported for backward compat
     _detect_vertex_color_source,
     _rasterize_vertex_colors,
@@ -204,10 +205,10 @@ def _get_filament_colors_from_settings(context):
     so that pixels painted with a virtual mixed color are assigned the
     correct virtual filament index on bake/quantize.
     """
+    from .helpers import _filament_colors_array
+
     settings = context.scene.mmu_paint
-    colors = []
-    for item in settings.init_filaments:
-        colors.append(tuple(item.color[:3]))
+    colors = [tuple(c) for c in _filament_colors_array(settings.init_filaments).tolist()]
 
     # Append virtual (mixed) filament display colors when present.
     # Only enabled, non-deleted entries contribute virtual slots —
@@ -960,8 +961,9 @@ class MMU_OT_bake_to_mmu(bpy.types.Operator):
         mesh.materials.append(mmu_mat)
         num_faces = len(mesh.polygons)
         if num_faces > 0:
-            material_indices = [0] * num_faces
-            mesh.polygons.foreach_set("material_index", material_indices)
+            mesh.polygons.foreach_set(
+                "material_index", np.zeros(num_faces, dtype=np.int32)
+            )
 
         # --- Set up 3mf custom properties ---
         # Write ONLY the physical filament colors to the mesh palette.  Mixed
@@ -977,6 +979,7 @@ class MMU_OT_bake_to_mmu(bpy.types.Operator):
         mesh["3mf_paint_default_extruder"] = 1  # 1-based
         mesh["3mf_paint_extruder_colors"] = str(colors_dict)
         mesh["3mf_num_physical_filaments"] = num_physical
+        _invalidate_panel_state()
 
         # --- Sync the paint panel ---
         settings.loaded_mesh_name = ""  # Force reload
@@ -1343,11 +1346,4 @@ bake_classes = (
 )
 
 
-def register():
-    for cls in bake_classes:
-        bpy.utils.register_class(cls)
-
-
-def unregister():
-    for cls in reversed(bake_classes):
-        bpy.utils.unregister_class(cls)
+register, unregister = bpy.utils.register_classes_factory(bake_classes)
@@ -27,8 +27,7 @@ works well for the simpler palettes typical of vertex-painted meshes.
 
 import numpy as np
 
-from ..common.colors import linear_to_srgb as _linear_to_srgb
-from ..common.logging import debug
+from ..common.logging import debug, debug_enabled
 
 from .helpers import _has_vertex_colors
 
@@ -50,6 +49,7 @@ def _collect_material_colors(obj):
     Near-duplicate colors (within ~5/255) are merged.
     """
     raw_colors = []
+    is_linear = []  # per raw color: node value (linear) vs diffuse_color (sRGB)
 
     for slot in obj.material_slots:
         mat = slot.material
@@ -58,25 +58,36 @@ def _collect_material_colors(obj):
 
         found = []
         if mat.use_nodes and mat.node_tree:
-            found = _extract_node_colors(mat.node_tree)
+            found = _extract_node_linear_colors(mat.node_tree)
 
-        # Fallback: viewport display color (already sRGB)
-        if not found:
+        if found:
+            raw_colors.extend(found)
+            is_linear.extend([True] * len(found))
+        else:
+            # Fallback: viewport display color (already sRGB)
             dc = mat.diffuse_color
-            found = [(dc[0], dc[1], dc[2])]
+            raw_colors.append((dc[0], dc[1], dc[2]))
+            is_linear.append(False)
 
-        raw_colors.extend(found)
+    if not raw_colors:
+        return []
 
-    return _deduplicate_colors(raw_colors, tolerance=5.0 / 255.0)
+    # One array conversion for every node color of every material.
+    colors = np.array(raw_colors, dtype=np.float64)
+    linear_mask = np.array(is_linear)
+    colors[linear_mask] = _linear_to_srgb_array(colors[linear_mask], exact=True)
+    return _deduplicate_colors([tuple(c) for c in colors.tolist()], tolerance=5.0 / 255.0)
 
 
-def _extract_node_colors(node_tree):
-    """Return a list of (r, g, b) sRGB tuples from the node tree.
+def _extract_node_linear_colors(node_tree):
+    """Return a list of linear (r, g, b) tuples from the node tree.
 
     Looks at every Principled BSDF and extracts colors from whatever
-    feeds its Base Color input.
+    feeds its Base Color input.  Upstream nodes shared by several BSDFs
+    are only walked once.
     """
     colors = []
+    cache = {}
     for node in node_tree.nodes:
         if node.type != "BSDF_PRINCIPLED":
             continue
@@ -87,20 +98,16 @@ def _extract_node_colors(node_tree):
 
         if base_input.is_linked:
             linked_node = base_input.links[0].from_node
-            colors.extend(_colors_from_node(linked_node))
+            colors.extend(_colors_from_node(linked_node, cache))
         else:
             v = base_input.default_value
-            colors.append((
-                _linear_to_srgb(v[0]),
-                _linear_to_srgb(v[1]),
-                _linear_to_srgb(v[2]),
-            ))
+            colors.append((v[0], v[1], v[2]))
 
     return colors
 
 
-def _colors_from_node(node):
-    """Extract one or more (r, g, b) sRGB colors from a shader node.
+def _colors_from_node(node, cache=None):
+    """Extract one or more linear (r, g, b) colors from a shader node.
 
     Supported node types:
     - **Color Ramp** (``VALTORGB``) — every color stop
@@ -108,40 +115,45 @@ def _colors_from_node(node):
     - **Hue/Sat, Gamma, Bright/Contrast** — the Color input default
     - **Mix / Mix RGB** — both A and B input defaults
     - **Separate/Combine** and other connector nodes — walks upstream
+
+    *cache* maps ``node.as_pointer()`` to the colors already extracted for
+    that node, so sub-trees reachable through several links (e.g. nested
+    Mix nodes sharing an input) are walked once.  The returned list may be
+    shared with the cache and must not be mutated.
     """
+    if cache is None:
+        cache = {}
+    key = node.as_pointer()
+    found = cache.get(key)
+    if found is None:
+        found = _colors_from_node_uncached(node, cache)
+        cache[key] = found
+    return found
+
+
+def _colors_from_node_uncached(node, cache):
+    """Body of :func:`_colors_from_node` — dispatch on the node type."""
     # ---- Color Ramp (most important for procedural setups) ----
     if node.type == "VALTORGB":
         found = []
         for stop in node.color_ramp.elements:
             c = stop.color  # linear RGBA
-            found.append((
-                _linear_to_srgb(c[0]),
-                _linear_to_srgb(c[1]),
-                _linear_to_srgb(c[2]),
-            ))
+            found.append((c[0], c[1], c[2]))
         return found
 
     # ---- RGB node ----
     if node.type == "RGB":
         v = node.outputs[0].default_value
-        return [(
-            _linear_to_srgb(v[0]),
-            _linear_to_srgb(v[1]),
-            _linear_to_srgb(v[2]),
-        )]
+        return [(v[0], v[1], v[2])]
 
     # ---- Adjustment nodes with a Color input ----
     if node.type in ("HUE_SAT", "GAMMA", "BRIGHTCONTRAST"):
         inp = node.inputs.get("Color")
         if inp and not inp.is_linked:
             v = inp.default_value
-            return [(
-                _linear_to_srgb(v[0]),
-                _linear_to_srgb(v[1]),
-                _linear_to_srgb(v[2]),
-            )]
+            return [(v[0], v[1], v[2])]
         if inp and inp.is_linked:
-            return _colors_from_node(inp.links[0].from_node)
+            return _colors_from_node(inp.links[0].from_node, cache)
 
     # ---- Mix / Mix RGB — collect both sides ----
     if node.type in ("MIX", "MIX_RGB"):
@@ -152,35 +164,37 @@ def _colors_from_node(node):
             if inp is None:
                 continue
             if inp.is_linked:
-                found.extend(_colors_from_node(inp.links[0].from_node))
+                found.extend(_colors_from_node(inp.links[0].from_node, cache))
             else:
                 v = inp.default_value
-                found.append((
-                    _linear_to_srgb(v[0]),
-                    _linear_to_srgb(v[1]),
-                    _linear_to_srgb(v[2]),
-                ))
+                found.append((v[0], v[1], v[2]))
         return found
 
     # ---- Walk upstream through passthrough / connector nodes ----
     color_input = node.inputs.get("Color") or node.inputs.get(0)
     if color_input and color_input.is_linked:
-        return _colors_from_node(color_input.links[0].from_node)
+        return _colors_from_node(color_input.links[0].from_node, cache)
 
     return []
 
 
 def _deduplicate_colors(colors, tolerance=0.02):
-    """Remove near-duplicate (r, g, b) tuples, preserving order."""
+    """Remove near-duplicate (r, g, b) tuples, preserving order.
+
+    A color is dropped when every channel is within *tolerance* of a color
+    already kept; each candidate is compared against all kept colors at once.
+    """
+    if not colors:
+        return []
+    arr = np.asarray(colors, dtype=np.float64)
+    kept = np.empty_like(arr)
     unique = []
-    for c in colors:
-        is_dup = False
-        for u in unique:
-            if all(abs(a - b) < tolerance for a, b in zip(c, u)):
-                is_dup = True
-                break
-        if not is_dup:
-            unique.append(c)
+    for i, c in enumerate(colors):
+        n = len(unique)
+        if n and (np.abs(kept[:n] - arr[i]) < tolerance).all(axis=1).any():
+            continue
+        kept[n] = arr[i]
+        unique.append(c)
     return unique
 
 
@@ -189,6 +203,61 @@ def _deduplicate_colors(colors, tolerance=0.02):
 # -------------------------------------------------------------------
 
 
+# Per-mesh result of _scan_material_sources, keyed by ``mesh.session_uid``.
+# Cleared by the paint panel's depsgraph handler whenever a material, node
+# tree, image or mesh changes, so repeated queries skip the node walk.
+_material_source_cache = {}
+
+
+def _clear_material_source_cache():
+    """Drop all cached material scans (see :data:`_material_source_cache`)."""
+    _material_source_cache.clear()
+
+
+def _scan_material_sources(mesh):
+    """Walk every material node of *mesh* once.
+
+    Returns ``(image, has_color_attribute_node)`` — the first non-paint
+    Image Texture image (or None), and whether any Principled BSDF takes
+    its Base Color from a Color Attribute / Attribute node.
+    """
+    image = None
+    has_ca_node = False
+    for mat in mesh.materials:
+        if not mat or not mat.use_nodes or not mat.node_tree:
+            continue
+        for node in mat.node_tree.nodes:
+            if node.type == "TEX_IMAGE":
+                # Skip images created by the paint suite itself
+                if image is None and node.image and not node.image.name.endswith("_MMU_Paint"):
+                    image = node.image
+            elif node.type == "BSDF_PRINCIPLED" and not has_ca_node:
+                base_input = node.inputs.get("Base Color")
+                if base_input and base_input.is_linked:
+                    src = base_input.links[0].from_node
+                    if src.type in ("ATTRIBUTE", "VERTEX_COLOR"):
+                        has_ca_node = True
+            if image is not None and has_ca_node:
+                return image, has_ca_node
+    return image, has_ca_node
+
+
+def _material_sources(obj):
+    """Cached :func:`_scan_material_sources` for *obj*'s mesh."""
+    mesh = obj.data
+    key = mesh.session_uid
+    cached = _material_source_cache.get(key)
+    if cached is not None:
+        image = cached[0]
+        try:
+            if image is None or image.name:
+                return cached
+        except ReferenceError:
+            pass  # Image was removed since the scan
+    cached = _material_source_cache[key] = _scan_material_sources(mesh)
+    return cached
+
+
 def _get_any_image_texture(obj):
     """Find the first Image Texture node with image data on the active object.
 
@@ -198,16 +267,7 @@ def _get_any_image_texture(obj):
     """
     if not obj or not obj.data or not obj.data.materials:
         return None
-    mesh = obj.data
-    for mat in mesh.materials:
-        if mat and mat.use_nodes and mat.node_tree:
-            for node in mat.node_tree.nodes:
-                if node.type == "TEX_IMAGE" and node.image:
-                    # Skip images created by the paint suite itself
-                    if node.image.name.endswith("_MMU_Paint"):
-                        continue
-                    return node.image
-    return None
+    return _material_sources(obj)[0]
 
 
 def _has_color_attribute_node(obj):
@@ -215,18 +275,7 @@ def _has_color_attribute_node(obj):
     connected to a Principled BSDF Base Color input."""
     if not obj or not obj.data or not obj.data.materials:
         return False
-    for mat in obj.data.materials:
-        if not mat or not mat.use_nodes or not mat.node_tree:
-            continue
-        for node in mat.node_tree.nodes:
-            if node.type != "BSDF_PRINCIPLED":
-                continue
-            base_input = node.inputs.get("Base Color")
-            if base_input and base_input.is_linked:
-                src = base_input.links[0].from_node
-                if src.type in ("ATTRIBUTE", "VERTEX_COLOR"):
-                    return True
-    return False
+    return _material_sources(obj)[1]
 
 
 # -------------------------------------------------------------------
@@ -236,26 +285,96 @@ def _has_color_attribute_node(obj):
 
 def _srgb_to_hsv_array(srgb):
     """Convert an (N, 3) sRGB array to HSV.  H in [0, 1] (cyclic), S/V in [0, 1]."""
+    srgb = np.asarray(srgb, dtype=np.float32)
     r, g, b = srgb[:, 0], srgb[:, 1], srgb[:, 2]
     maxc = np.maximum(np.maximum(r, g), b)
     minc = np.minimum(np.minimum(r, g), b)
     delta = maxc - minc
-    v = maxc
-    safe_maxc = np.where(maxc > 0, maxc, 1.0)
-    s = np.where(maxc > 0, delta / safe_maxc, 0.0)
-    h = np.zeros_like(maxc)
-    mask = delta > 0
-    idx = mask & (maxc == r)
-    h[idx] = ((g[idx] - b[idx]) / delta[idx]) % 6.0
-    idx = mask & (maxc == g)
-    h[idx] = ((b[idx] - r[idx]) / delta[idx]) + 2.0
-    idx = mask & (maxc == b)
-    h[idx] = ((r[idx] - g[idx]) / delta[idx]) + 4.0
-    h = h / 6.0  # normalise to [0, 1]
-    return np.stack([h, s, v], axis=-1).astype(np.float32)
-
-
-def _bin_pixels_hsv(srgb):
+
+    # Write each channel straight into the float32 result instead of
+    # stacking float64 temporaries and casting them afterwards.
+    hsv = np.empty((len(srgb), 3), dtype=np.float32)
+    hsv[:, 2] = maxc
+    s = hsv[:, 1]
+    s[:] = 0.0
+    np.divide(delta, maxc, out=s, where=maxc > 0)
+
+    # Branchless hue: evaluate the sector formula for every channel and
+    # gather the one belonging to the max channel.  Ties go to the later
+    # channel (B over G over R), hence argmax on the reversed columns.
+    chromatic = delta > 0
+    safe_delta = np.where(chromatic, delta, 1.0)
+    max_channel = 2 - np.argmax(srgb[:, ::-1], axis=1)
+    h = np.choose(max_channel, [
+        ((g - b) / safe_delta) % 6.0,
+        (b - r) / safe_delta + 2.0,
+        (r - g) / safe_delta + 4.0,
+    ])
+    hsv[:, 0] = np.where(chromatic, h / 6.0, 0.0)  # normalise to [0, 1]
+    return hsv
+
+
+def _segment_percentile(sorted_values, starts, counts, q):
+    """Percentile *q* (0-1) of every contiguous sorted run in *sorted_values*.
+
+    Run *i* is ``sorted_values[starts[i]:starts[i] + counts[i]]``.  Uses the
+    same linear interpolation as ``np.percentile`` / ``np.median``.
+    """
+    pos = (counts - 1) * q
+    lo = np.floor(pos).astype(np.intp)
+    hi = np.minimum(lo + 1, counts - 1)
+    frac = pos - lo
+    a = sorted_values[starts + lo]
+    b = sorted_values[starts + hi]
+    return a + (b - a) * frac
+
+
+def _segment_weighted_percentile(sorted_values, sorted_weights, starts, counts, q):
+    """Weighted percentile *q* (0-1) of every contiguous sorted run.
+
+    Returns, for each run, the first value whose cumulative weight within
+    the run reaches ``q`` of the run's total weight (no interpolation).
+    """
+    cum = np.cumsum(sorted_weights)
+    base = cum[starts] - sorted_weights[starts]
+    totals = cum[starts + counts - 1] - base
+    idx = np.searchsorted(cum, base + q * totals, side="left")
+    idx = np.clip(idx, starts, starts + counts - 1)
+    return sorted_values[idx]
+
+
+_HISTOGRAM_BITS = 5          # bits per channel for the uniform pre-quantization
+_HISTOGRAM_CHUNK = 1 << 18   # rows per block when streaming into a histogram
+
+
+def _accumulate_histogram(counts, sums, srgb, bits=_HISTOGRAM_BITS):
+    """Add the (N, 3) sRGB rows of *srgb* to the flat cell histogram.
+
+    *counts* holds the number of rows per cell and *sums* (cells, 3) their
+    per-channel sRGB totals, so cells can be represented by their mean.
+    """
+    levels = (1 << bits) - 1
+    q = np.rint(np.clip(srgb, 0.0, 1.0) * levels).astype(np.uint32)
+    keys = (q[:, 0] << (2 * bits)) | (q[:, 1] << bits) | q[:, 2]
+    n = len(counts)
+    counts += np.bincount(keys, minlength=n)
+    for c in range(3):
+        sums[:, c] += np.bincount(keys, weights=srgb[:, c], minlength=n)
+
+
+def _histogram_means(counts, sums):
+    """Return ``(means, weights)`` for the occupied cells of the histogram.
+
+    *means* is the average sRGB color of the rows in each cell, so it is a
+    color that actually occurs in the data rather than the cell's center.
+    """
+    nz = np.flatnonzero(counts)
+    weights = counts[nz]
+    means = (sums[nz] / weights[:, None]).astype(np.float32)
+    return means, weights
+
+
+def _bin_pixels_hsv(srgb, weights=None):
     """Bin an (N, 3) sRGB array by **Hue x Saturation**, ignoring brightness.
 
     Chromatic pixels (S >= 0.10) are placed into ``HUE_BINS x SAT_BINS``
@@ -264,10 +383,15 @@ def _bin_pixels_hsv(srgb):
     same hue into one bin, which is far better for photo-realistic textures
     with baked-in lighting.
 
-    Returns ``(bin_colors, bin_counts)`` where *bin_colors* is (M, 3) sRGB
-    center-values and *bin_counts* is (M,), both sorted descending by count.
+    Returns ``(bin_colors, bin_hsv, bin_counts)`` where *bin_colors* is
+    (M, 3) sRGB center-values, *bin_hsv* their HSV (so
+    :func:`_select_diverse_colors` need not convert again) and *bin_counts*
+    is (M,), all sorted descending by count.
     The representative sRGB color of each HS bin is the **median** brightness
     at full saturation -> natural-looking palette entry.
+
+    *weights* (N,) optionally gives a pixel count per row, e.g. the output
+    of :func:`_histogram_means`; counts and percentiles are then weighted.
     """
     HUE_BINS = 18
     SAT_BINS = 6
@@ -277,102 +401,170 @@ def _bin_pixels_hsv(srgb):
     hsv = _srgb_to_hsv_array(srgb)  # (N, 3)
     is_chromatic = hsv[:, 1] >= ACHROMATIC_THR
 
-    # ----- chromatic bins (HS, ignore V) ---------------------------------
-    chrom_hsv = hsv[is_chromatic]
-    chrom_srgb = srgb[is_chromatic]
-
-    h_idx = (chrom_hsv[:, 0] * (HUE_BINS - 0.001)).astype(np.uint16)
+    # ----- bin id per pixel, in one pass over the HSV array -------------
+    # Chromatic pixels bin by hue x saturation (ignoring V) at ids
+    # 1..HUE_BINS*SAT_BINS; achromatic pixels bin by value in a separate
+    # id space above that.  Computing both candidates and selecting with
+    # np.where avoids boolean-index copies of the (N, 3) arrays and the
+    # concatenation needed to merge them again.
+    h_idx = (hsv[:, 0] * (HUE_BINS - 0.001)).astype(np.uint32)
     s_idx = np.clip(
-        ((chrom_hsv[:, 1] - ACHROMATIC_THR) / (1.0 - ACHROMATIC_THR) * (SAT_BINS - 0.001)).astype(np.uint16),
+        (hsv[:, 1] - ACHROMATIC_THR) / (1.0 - ACHROMATIC_THR) * (SAT_BINS - 0.001),
         0, SAT_BINS - 1,
-    )
-    chrom_bin_ids = h_idx.astype(np.uint32) * SAT_BINS + s_idx.astype(np.uint32)
-
-    # offset of 1 so bin 0 is reserved for the achromatic range
-    chrom_bin_ids += 1
-
-    # ----- achromatic bins (value only) ----------------------------------
-    achrom_hsv = hsv[~is_chromatic]
-    achrom_srgb = srgb[~is_chromatic]
-    v_idx = (achrom_hsv[:, 2] * (VAL_BINS - 0.001)).astype(np.uint16)
-    # IDs 0 is unused; achromatic range uses negative to avoid clash --
-    # actually just use a separate ID space above chromatic max.
+    ).astype(np.uint32)
+    v_idx = (hsv[:, 2] * (VAL_BINS - 0.001)).astype(np.uint32)
     ACHROM_OFFSET = np.uint32(HUE_BINS * SAT_BINS + 1)
-    achrom_bin_ids = v_idx.astype(np.uint32) + ACHROM_OFFSET
-
-    # ----- merge and count -----------------------------------------------
-    all_bin_ids = np.concatenate([chrom_bin_ids, achrom_bin_ids]) if len(achrom_bin_ids) else chrom_bin_ids
-    all_srgb = np.concatenate([chrom_srgb, achrom_srgb]) if len(achrom_srgb) else chrom_srgb
-    all_hsv = np.concatenate([chrom_hsv, achrom_hsv]) if len(achrom_hsv) else chrom_hsv
-
-    unique_bins, inv, counts = np.unique(all_bin_ids, return_inverse=True, return_counts=True)
-    order = np.argsort(-counts)
-    unique_bins = unique_bins[order]
-    counts = counts[order]
-
-    # Build a representative sRGB color per bin.
-    # For chromatic bins: take median V at the bin's center H/S -> vivid.
-    # For achromatic bins: simple grey at the bin's center V.
-    colors = np.empty((len(unique_bins), 3), dtype=np.float32)
+    bin_ids = np.where(is_chromatic, h_idx * SAT_BINS + s_idx + 1, v_idx + ACHROM_OFFSET)
+
+    # The bin id space is tiny (HUE_BINS*SAT_BINS + VAL_BINS + 1), so a
+    # bincount replaces np.unique's sort and no inverse index is needed:
+    # ascending bin ids already group the rows in unique_bins order.
+    bin_population = np.bincount(bin_ids)
+    unique_bins = np.flatnonzero(bin_population)
+    counts = bin_population[unique_bins]
+    starts = np.cumsum(counts) - counts
+
+    if len(unique_bins) == len(bin_ids):
+        # Every bin holds a single row (tiny inputs, e.g. a handful of
+        # histogram cells): each row is its own median and percentile, so
+        # the representative is the row itself and nothing needs sorting.
+        colors = np.clip(srgb[np.argsort(bin_ids)], 0.0, 1.0).astype(np.float32)
+    else:
+        # Per-bin order statistics without a Python loop: sort each column by
+        # (bin, value) so every bin's members form one contiguous sorted run.
+        # Values lie in [0, 1], so ``2 * bin + value`` is an exact float64 key
+        # whose plain sort equals that two-key order and is much cheaper than
+        # np.lexsort; subtracting the run's base recovers the sorted values.
+        key_base = 2.0 * bin_ids
+        if weights is None:
+            run_base = 2.0 * np.repeat(unique_bins, counts)
+
+            def _percentiles(values, qs):
+                ordered = (np.sort(key_base + values) - run_base).astype(values.dtype)
+                return [_segment_percentile(ordered, starts, counts, q) for q in qs]
+        else:
+            def _percentiles(values, qs):
+                order = np.argsort(key_base + values)
+                ordered, ordered_w = values[order], weights[order]
+                return [_segment_weighted_percentile(ordered, ordered_w, starts, counts, q) for q in qs]
 
-    for out_i, bid in enumerate(unique_bins):
-        mask = all_bin_ids == bid
-        member_srgb = all_srgb[mask]
-        member_hsv = all_hsv[mask]
+        # Build a representative sRGB color per bin.
         # Representative color: median hue/sat (stable), but 60th
         # percentile brightness.  On 3D models shadows cover more
         # surface area than highlights, so the median V is too dark.
         # The 60th percentile nudges toward "typical lit surface" while
         # keeping dark tones recognisably dark.
-        med_srgb = np.median(member_srgb, axis=0)
-        v_60 = np.percentile(member_hsv[:, 2], 60)
-        med_v = np.median(member_hsv[:, 2])
+        med_srgb = np.stack([_percentiles(srgb[:, c], (0.5,))[0] for c in range(3)], axis=-1)
+        med_v, v_60 = _percentiles(hsv[:, 2], (0.5, 0.6))
+
         # Scale the median sRGB toward the brighter representative,
         # but cap at 1.3× to avoid washing out dark colors.
-        if med_v > 0.01:
-            boost = min(v_60 / med_v, 1.3)
-            colors[out_i] = np.clip(med_srgb * boost, 0.0, 1.0)
-        else:
-            colors[out_i] = med_srgb
+        lit = med_v > 0.01
+        boost = np.where(lit, np.minimum(v_60 / np.where(lit, med_v, 1.0), 1.3), 1.0)
+        colors = np.clip(med_srgb * boost[:, np.newaxis], 0.0, 1.0).astype(np.float32)
+
+    if weights is not None:
+        counts = np.bincount(bin_ids, weights=weights)[unique_bins].astype(np.int64)
+
+    order = np.argsort(-counts)
+    unique_bins = unique_bins[order]
+    counts = counts[order]
+    colors = colors[order]
+    colors_hsv = _srgb_to_hsv_array(colors)
 
-    debug(f"[Detect] _bin_pixels_hsv: {len(srgb)} pixels -> {len(unique_bins)} HS/V bins "
-          f"(chromatic={int(np.sum(is_chromatic))}, achromatic={int(np.sum(~is_chromatic))})")
-    return colors, counts
+    if debug_enabled():
+        n_chromatic = int(np.count_nonzero(is_chromatic))
+        debug(f"[Detect] _bin_pixels_hsv: {len(srgb)} pixels -> {len(unique_bins)} HS/V bins "
+              f"(chromatic={n_chromatic}, achromatic={len(srgb) - n_chromatic})")
+    return colors, colors_hsv, counts
 
 
-def _hs_distance(colors_a, colors_b_row):
-    """Cyclic Hue-Saturation-Value distance between (N,3) and (3,) sRGB arrays.
+# Per-channel weights of the HSV distance (hue, saturation, value).  Hue
+# gets the most weight; value is included so dark navy and bright sky blue
+# stay distinct.
+_HSV_DIST_WEIGHTS = np.sqrt(np.array([6.0, 3.0, 2.0], dtype=np.float32))
+_HUE_PERIOD = float(_HSV_DIST_WEIGHTS[0])  # hue wrap-around after scaling
+
+
+def _hs_distance_sq(colors_a, colors_b_row):
+    """Squared cyclic Hue-Saturation-Value distance between (N,3) and (3,) sRGB arrays.
 
     Converts to HSV, then computes a weighted distance using cyclic hue,
     saturation, and value.  Value is included so that dark navy vs bright
     sky blue register as distinct colors.  Achromatic entries (S < 0.10)
     use Euclidean RGB distance instead so that black/white/grey are
-    handled correctly.
+    handled correctly.  Squared, so callers that only compare or take a
+    running minimum never pay for a square root.
     """
-    W_H = 6.0
-    W_S = 3.0
-    W_V = 2.0
-
     hsv_a = _srgb_to_hsv_array(colors_a)  # (N, 3)
     hsv_b = _srgb_to_hsv_array(colors_b_row.reshape(1, 3))  # (1, 3)
+    return _hs_distance_sq_precomputed(
+        colors_a, _scaled_hsv(hsv_a), _achromatic_blend(hsv_a),
+        colors_b_row, _scaled_hsv(hsv_b)[0],
+    )
+
+
+def _achromatic_blend(hsv):
+    """Per-row weight of the HSV distance vs the RGB fallback (0 = grey)."""
+    return np.clip(hsv[:, 1] / 0.10, 0.0, 1.0)
+
+
+def _scaled_hsv(hsv):
+    """Scale HSV rows by the square-rooted distance weights.
+
+    Plain Euclidean distance between scaled rows (with hue wrapping at
+    :data:`_HUE_PERIOD`) is the weighted HSV distance.
+    """
+    return hsv * _HSV_DIST_WEIGHTS
+
+
+def _hs_distance_sq_precomputed(colors_a, scaled_a, alpha_a, color_b, scaled_b, work=None):
+    """:func:`_hs_distance_sq` with both sides already converted and scaled.
 
-    dh = np.abs(hsv_a[:, 0] - hsv_b[0, 0])
-    dh = np.minimum(dh, 1.0 - dh)
-    ds = hsv_a[:, 1] - hsv_b[0, 1]
-    dv = hsv_a[:, 2] - hsv_b[0, 2]
+    *scaled_a* (from :func:`_scaled_hsv`) and *alpha_a* (from
+    :func:`_achromatic_blend`) belong to the (N, 3) *colors_a*; *scaled_b*
+    is the (3,) scaled HSV of *color_b*.
 
-    hsv_dist = np.sqrt(W_H * dh ** 2 + W_S * ds ** 2 + W_V * dv ** 2)
+    *work* optionally supplies scratch buffers from :func:`_hs_distance_work`
+    so repeated calls allocate nothing; the result then lives in one of them
+    and is overwritten by the next call.
+    """
+    if work is None:
+        work = _hs_distance_work(colors_a)
+    d, d_rgb, hue_wrap, hsv_dist_sq, rgb_dist_sq = work
+
+    np.subtract(scaled_a, scaled_b, out=d)
+    np.abs(d, out=d)
+    np.subtract(_HUE_PERIOD, d[:, 0], out=hue_wrap)
+    np.minimum(d[:, 0], hue_wrap, out=d[:, 0])
+    np.einsum("ij,ij->i", d, d, out=hsv_dist_sq)
 
     # RGB fallback for achromatic pixels
-    rgb_dist = np.sqrt(np.sum((colors_a - colors_b_row) ** 2, axis=1))
+    np.subtract(colors_a, color_b, out=d_rgb)
+    np.einsum("ij,ij->i", d_rgb, d_rgb, out=rgb_dist_sq)
 
     # Blend: use HSV for chromatic, RGB for achromatic
-    sat = hsv_a[:, 1]
-    alpha = np.clip(sat / 0.10, 0.0, 1.0)
-    return alpha * hsv_dist + (1.0 - alpha) * rgb_dist
+    # (rgb + alpha * (hsv - rgb), evaluated in place).
+    hsv_dist_sq -= rgb_dist_sq
+    hsv_dist_sq *= alpha_a
+    hsv_dist_sq += rgb_dist_sq
+    return hsv_dist_sq
+
+
+def _hs_distance_work(colors_a):
+    """Allocate the scratch buffers used by :func:`_hs_distance_sq_precomputed`."""
+    n = len(colors_a)
+    dtype = np.result_type(colors_a, np.float32)
+    return (
+        np.empty((n, 3), dtype=dtype),  # scaled HSV difference
+        np.empty((n, 3), dtype=dtype),  # RGB difference
+        np.empty(n, dtype=dtype),       # wrapped hue difference
+        np.empty(n, dtype=dtype),       # HSV distance / result
+        np.empty(n, dtype=dtype),       # RGB distance
+    )
 
 
-def _select_diverse_colors(bin_colors, bin_counts, num_colors):
+def _select_diverse_colors(bin_colors, bin_counts, num_colors, bin_hsv=None):
     """Greedily pick *num_colors* that are both frequent AND visually diverse.
 
     1. First pick = most frequent bin.
@@ -381,48 +573,72 @@ def _select_diverse_colors(bin_colors, bin_counts, num_colors):
        saturation + value, with RGB fallback for greys) to the nearest
        already-selected color.
 
+    *bin_hsv* is the HSV of *bin_colors* when the caller already has it
+    (see :func:`_bin_pixels_hsv`).
+
     Returns a list of ``(r, g, b)`` sRGB tuples.
     """
     n = len(bin_colors)
     if n == 0:
         return []
     if n <= num_colors:
-        return [tuple(bin_colors[i]) for i in range(n)]
+        return [tuple(c) for c in bin_colors.tolist()]
 
     max_count = float(bin_counts[0])
     weights = np.sqrt(bin_counts.astype(np.float64) / max_count)
 
-    debug(f"[Detect] _select_diverse_colors: {n} bins, picking {num_colors}")
-    debug("[Detect]   Top 10 bins by frequency:")
-    for i in range(min(10, n)):
-        c = bin_colors[i]
-        debug(f"    bin[{i}] sRGB ({c[0]:.3f}, {c[1]:.3f}, {c[2]:.3f})  count={bin_counts[i]}  weight={weights[i]:.4f}")
+    # Per-bin debug output indexes and formats NumPy scalars; skip it
+    # entirely when nobody is listening.
+    verbose = debug_enabled()
+    if verbose:
+        debug(f"[Detect] _select_diverse_colors: {n} bins, picking {num_colors}")
+        debug("[Detect]   Top 10 bins by frequency:")
+        for i in range(min(10, n)):
+            c = bin_colors[i]
+            debug(f"    bin[{i}] sRGB ({c[0]:.3f}, {c[1]:.3f}, {c[2]:.3f})  "
+                  f"count={bin_counts[i]}  weight={weights[i]:.4f}")
 
     selected_indices = [0]
-    min_dists = np.full(n, np.inf, dtype=np.float64)
+    min_dists_sq = np.full(n, np.inf, dtype=np.float64)
+
+    # bin_colors never changes, so convert and scale its HSV once up front.
+    if bin_hsv is None:
+        bin_hsv = _srgb_to_hsv_array(bin_colors)
+    bin_alpha = _achromatic_blend(bin_hsv)
+    bin_scaled = _scaled_hsv(bin_hsv)
+
+    # Scratch buffers reused by every step, so the loop allocates nothing.
+    work = _hs_distance_work(bin_colors)
+    min_dists = np.empty(n, dtype=np.float64)
+    scores = np.empty(n, dtype=np.float64)
 
     for step in range(num_colors - 1):
-        last_sel = bin_colors[selected_indices[-1]]
+        last = selected_indices[-1]
         # HSV-dominant distance to the latest picked color
-        dists = _hs_distance(bin_colors, last_sel)
-        min_dists = np.minimum(min_dists, dists)
-
-        scores = weights * min_dists
-        for idx in selected_indices:
-            scores[idx] = -1.0
+        dists_sq = _hs_distance_sq_precomputed(
+            bin_colors, bin_scaled, bin_alpha, bin_colors[last], bin_scaled[last], work,
+        )
+        np.minimum(min_dists_sq, dists_sq, out=min_dists_sq)
+
+        # The minimum is kept squared; only the scores need a square root.
+        np.sqrt(min_dists_sq, out=min_dists)
+        np.multiply(weights, min_dists, out=scores)
+        scores[selected_indices] = -1.0
         best = int(np.argmax(scores))
-        c = bin_colors[best]
-        debug(f"    Step {step + 1}: picked bin[{best}] sRGB ({c[0]:.3f}, {c[1]:.3f}, {c[2]:.3f})  "
-              f"count={bin_counts[best]}  min_dist={min_dists[best]:.4f}  score={scores[best]:.4f}")
+        if verbose:
+            c = bin_colors[best]
+            debug(f"    Step {step + 1}: picked bin[{best}] sRGB ({c[0]:.3f}, {c[1]:.3f}, {c[2]:.3f})  "
+                  f"count={bin_counts[best]}  min_dist={min_dists[best]:.4f}  score={scores[best]:.4f}")
         selected_indices.append(best)
 
-    result = [tuple(bin_colors[i]) for i in selected_indices]
-    debug(f"[Detect] Final selection: {result}")
+    result = [tuple(c) for c in bin_colors[selected_indices].tolist()]
+    if verbose:
+        debug(f"[Detect] Final selection: {result}")
     return result
 
 
-def _linear_to_srgb_array(rgb):
-    """Convert an (N, 3) linear-light array to sRGB, clamped to [0, 1]."""
+def _linear_to_srgb_exact(rgb):
+    """Convert a linear-light array to sRGB with the exact piecewise curve."""
     srgb = np.where(
         rgb <= 0.0031308,
         rgb * 12.92,
@@ -431,6 +647,24 @@ def _linear_to_srgb_array(rgb):
     return np.clip(srgb, 0.0, 1.0)
 
 
+# Linear -> sRGB lookup table.  Palette detection bins colors far more
+# coarsely than the table's worst-case error (~1.5e-3 near black), and a
+# gather is much cheaper than evaluating pow() for every pixel.
+_SRGB_LUT_SIZE = 4096
+_SRGB_LUT = _linear_to_srgb_exact(np.linspace(0.0, 1.0, _SRGB_LUT_SIZE)).astype(np.float32)
+
+
+def _linear_to_srgb_array(rgb, exact=False):
+    """Convert an (N, 3) linear-light array to sRGB, clamped to [0, 1].
+
+    Uses :data:`_SRGB_LUT` unless *exact* is set.
+    """
+    if exact:
+        return _linear_to_srgb_exact(rgb)
+    scaled = np.clip(rgb, 0.0, 1.0) * (_SRGB_LUT_SIZE - 1)
+    return _SRGB_LUT[np.rint(scaled).astype(np.intp)]
+
+
 def _srgb_to_linear_array(srgb):
     """Convert an (N, 3) sRGB array to linear-light, clamped to [0, 1]."""
     return np.where(
@@ -492,6 +726,7 @@ def _oklab_to_srgb(lab):
 _MAX_PER_CELL = 200    # max pixels sampled per sRGB grid cell
 _CELL_GRID = 8         # grid divisions per channel  (8^3 = 512 cells total)
 _MAX_ITER = 25         # k-means iterations (converges in <15 typically)
+_MAX_TEXTURE_PIXELS = 262144  # decimate larger images to ~512x512 before detection
 
 
 def _spatially_balanced_sample(srgb, max_per_cell, grid_size):
@@ -609,21 +844,23 @@ def _select_diverse_from_centers(centers_srgb, counts, num_colors):
     if n == 0:
         return []
     if n <= num_colors:
-        return [tuple(centers_srgb[i]) for i in range(n)]
+        return [tuple(c) for c in centers_srgb.tolist()]
 
     centers_lab = _srgb_to_oklab(centers_srgb)
     max_count = float(np.max(counts))
     # Fourth-root: a cluster 10000× larger only gets 10× weight
     weights = np.power(counts.astype(np.float64) / max_count, 0.25)
 
-    debug(f"[Detect] _select_diverse: {n} clusters, picking {num_colors}")
+    verbose = debug_enabled()
     order = np.argsort(-counts)
-    debug("[Detect]   Top 10 clusters by count:")
-    for rank in range(min(10, n)):
-        i = order[rank]
-        c = centers_srgb[i]
-        debug(f"    cluster[{i}] sRGB ({c[0]:.3f}, {c[1]:.3f}, {c[2]:.3f})  "
-              f"count={counts[i]}  weight={weights[i]:.4f}")
+    if verbose:
+        debug(f"[Detect] _select_diverse: {n} clusters, picking {num_colors}")
+        debug("[Detect]   Top 10 clusters by count:")
+        for rank in range(min(10, n)):
+            i = order[rank]
+            c = centers_srgb[i]
+            debug(f"    cluster[{i}] sRGB ({c[0]:.3f}, {c[1]:.3f}, {c[2]:.3f})  "
+                  f"count={counts[i]}  weight={weights[i]:.4f}")
 
     # First pick: most frequent cluster
     selected = [int(order[0])]
@@ -638,13 +875,15 @@ def _select_diverse_from_centers(centers_srgb, counts, num_colors):
         for idx in selected:
             scores[idx] = -1.0
         best = int(np.argmax(scores))
-        c = centers_srgb[best]
-        debug(f"    Step {step + 1}: picked cluster[{best}] sRGB ({c[0]:.3f}, {c[1]:.3f}, {c[2]:.3f})  "
-              f"count={counts[best]}  min_dist={min_dists[best]:.4f}  score={scores[best]:.4f}")
+        if verbose:
+            c = centers_srgb[best]
+            debug(f"    Step {step + 1}: picked cluster[{best}] sRGB ({c[0]:.3f}, {c[1]:.3f}, {c[2]:.3f})  "
+                  f"count={counts[best]}  min_dist={min_dists[best]:.4f}  score={scores[best]:.4f}")
         selected.append(best)
 
-    result = [tuple(centers_srgb[i]) for i in selected]
-    debug(f"[Detect] Final palette: {result}")
+    result = [tuple(c) for c in centers_srgb[selected].tolist()]
+    if verbose:
+        debug(f"[Detect] Final palette: {result}")
     return result
 
 
@@ -652,7 +891,8 @@ def _extract_texture_colors(image, num_colors):
     """Extract *num_colors* dominant, visually diverse colors from *image*.
 
     Pipeline:
-    1. Read pixels, discard transparent and near-white.
+    1. Read pixels, decimate large images to ~*_MAX_TEXTURE_PIXELS*,
+       discard transparent and near-white.
     2. Subsample to *_MAX_SAMPLE* pixels for speed.
     3. Convert to OKLab (perceptually uniform color space).
     4. K-means++ with ``k = num_colors * 3`` (overclustering).
@@ -672,9 +912,23 @@ def _extract_texture_colors(image, num_colors):
     pixels = flat.reshape(-1, 4)  # (N, RGBA)
     debug(f"[Detect]   Total pixels: {len(pixels)}")
 
-    # Discard fully transparent pixels
+    # Palette detection does not need full resolution: a regular
+    # decimation keeps the colour distribution while shrinking every
+    # downstream step.  ``foreach_get`` has no strided read, so the full
+    # buffer is still fetched once.
+    stride = max(1, int(np.sqrt((w * h) / _MAX_TEXTURE_PIXELS)))
+    if stride > 1:
+        pixels = pixels.reshape(h, w, 4)[::stride, ::stride].reshape(-1, 4)
+        del flat
+        debug(f"[Detect]   Decimated by {stride} -> {len(pixels)} pixels")
+
+    # Discard fully transparent pixels; fully opaque images (the common
+    # case) keep a view instead of paying for a boolean-index copy.
     opaque_mask = pixels[:, 3] >= 0.01
-    rgb_linear = pixels[opaque_mask, :3]  # (M, 3) linear RGB
+    if opaque_mask.all():
+        rgb_linear = pixels[:, :3]  # (N, 3) linear RGB view
+    else:
+        rgb_linear = pixels[opaque_mask, :3]  # (M, 3) linear RGB
     debug(f"[Detect]   Opaque pixels: {len(rgb_linear)}")
     if rgb_linear.size == 0:
         return []
@@ -687,12 +941,14 @@ def _extract_texture_colors(image, num_colors):
     # than 5 % of the opaque pixels it is likely intentional content and must
     # be kept.
     near_white = np.all(srgb > 0.94, axis=1)
-    near_white_frac = np.sum(near_white) / max(len(srgb), 1)
+    n_white = int(np.count_nonzero(near_white))
+    near_white_frac = n_white / max(len(srgb), 1)
     if near_white_frac < 0.05:
-        debug(f"[Detect]   Near-white pixels discarded: {np.sum(near_white)} ({near_white_frac:.1%} — background)")
-        srgb = srgb[~near_white]
+        debug(f"[Detect]   Near-white pixels discarded: {n_white} ({near_white_frac:.1%} — background)")
+        if n_white:
+            srgb = srgb[~near_white]
     else:
-        debug(f"[Detect]   Near-white pixels kept: {np.sum(near_white)} ({near_white_frac:.1%} — treated as content)")
+        debug(f"[Detect]   Near-white pixels kept: {n_white} ({near_white_frac:.1%} — treated as content)")
     debug(f"[Detect]   Remaining pixels: {len(srgb)}")
     if len(srgb) == 0:
         return []
@@ -743,23 +999,39 @@ def _extract_vertex_colors(obj, num_colors):
     rgb = flat.reshape(-1, 4)[:, :3]  # (N, 3) -- already linear in Blender
 
     # Sample first few values for debugging
-    debug("[Detect]   First 5 raw linear RGB values:")
-    for i in range(min(5, len(rgb))):
-        debug(f"    [{i}] ({rgb[i, 0]:.4f}, {rgb[i, 1]:.4f}, {rgb[i, 2]:.4f})")
-
-    srgb = _linear_to_srgb_array(rgb)
-    debug("[Detect]   First 5 sRGB values:")
-    for i in range(min(5, len(srgb))):
-        debug(f"    [{i}] ({srgb[i, 0]:.4f}, {srgb[i, 1]:.4f}, {srgb[i, 2]:.4f})")
-
-    # Discard near-white pixels (bare/untextured regions)
-    near_white = np.all(srgb > 0.94, axis=1)
-    debug(f"[Detect]   Near-white discarded: {np.sum(near_white)} / {len(srgb)}")
-    srgb = srgb[~near_white]
-    if srgb.size == 0:
+    verbose = debug_enabled()
+    if verbose:
+        debug("[Detect]   First 5 raw linear RGB values:")
+        for i in range(min(5, len(rgb))):
+            debug(f"    [{i}] ({rgb[i, 0]:.4f}, {rgb[i, 1]:.4f}, {rgb[i, 2]:.4f})")
+
+    # Convert, drop near-white (bare/untextured regions) and quantize in
+    # blocks so the sRGB copy, masks and keys never exist at full size.
+    # Uniform 15-bit pre-quantization: HSV binning then runs on at most
+    # 32768 weighted cell means instead of every element.
+    cells = 1 << (3 * _HISTOGRAM_BITS)
+    counts = np.zeros(cells, dtype=np.int64)
+    sums = np.zeros((cells, 3), dtype=np.float64)
+    near_white_total = 0
+    for start in range(0, len(rgb), _HISTOGRAM_CHUNK):
+        srgb = _linear_to_srgb_array(rgb[start:start + _HISTOGRAM_CHUNK])
+        if verbose and start == 0:
+            debug("[Detect]   First 5 sRGB values:")
+            for i in range(min(5, len(srgb))):
+                debug(f"    [{i}] ({srgb[i, 0]:.4f}, {srgb[i, 1]:.4f}, {srgb[i, 2]:.4f})")
+        near_white = np.all(srgb > 0.94, axis=1)
+        n_white = int(np.count_nonzero(near_white))
+        if n_white:
+            near_white_total += n_white
+            srgb = srgb[~near_white]
+        _accumulate_histogram(counts, sums, srgb)
+    debug(f"[Detect]   Near-white discarded: {near_white_total} / {len(rgb)}")
+    if near_white_total == len(rgb):
         debug("[Detect]   All pixels were near-white, nothing left")
         return []
 
-    bin_colors, bin_counts = _bin_pixels_hsv(srgb)
+    means, weights = _histogram_means(counts, sums)
+    debug(f"[Detect]   Quantized {len(rgb) - near_white_total} values -> {len(means)} RGB cells")
+    bin_colors, bin_hsv, bin_counts = _bin_pixels_hsv(means, weights)
     debug(f"[Detect]   Unique bins: {len(bin_colors)}")
-    return _select_diverse_colors(bin_colors, bin_counts, num_colors)
+    return _select_diverse_colors(bin_colors, bin_counts, num_colors, bin_hsv)
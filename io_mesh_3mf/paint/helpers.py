@@ -18,11 +18,13 @@ package.
 
 import ast
 
+import numpy as np
 import bpy
 
 from ..common.colors import hex_to_rgb as _rgb_from_hex
 from ..common.colors import rgb_to_hex as _hex_from_rgb
 from ..common.colors import srgb_to_linear as _srgb_to_linear
+from ..common.logging import warn
 
 
 # ---------------------------------------------------------------------------
@@ -139,18 +141,191 @@ def _get_layer_image(obj, layer_type):
 # ===================================================================
 
 
+# Material custom property remembering the name of the color paint
+# Image Texture node, so it can be resolved without scanning the tree.
+PAINT_NODE_KEY = "3mf_paint_node"
+
+
 def _get_paint_image(obj):
-    """Find the MMU paint texture image on the object's material, or None."""
+    """Find the MMU paint texture image on the object's material, or None.
+
+    Tries the paint node name cached on each material (``PAINT_NODE_KEY``)
+    before scanning its nodes.  Never writes the cache, so it is safe from
+    ``poll`` and ``draw``.
+    """
     if not obj or not obj.data or not obj.data.materials:
         return None
     for mat in obj.data.materials:
         if mat and mat.use_nodes:
-            for node in mat.node_tree.nodes:
+            nodes = mat.node_tree.nodes
+            cached = nodes.get(mat.get(PAINT_NODE_KEY, ""))
+            if cached is not None and cached.type == "TEX_IMAGE" and cached.image:
+                return cached.image
+            for node in nodes:
                 if node.type == "TEX_IMAGE" and node.image:
                     return node.image
     return None
 
 
+def _find_paint_texture_node(mat):
+    """Return the color paint Image Texture node of *mat*, or None.
+
+    Resolves the node by the name cached on the material first and only
+    falls back to scanning for the first TEX_IMAGE node (caching its name)
+    when that misses.
+    """
+    if not mat or not mat.use_nodes or not mat.node_tree:
+        return None
+    nodes = mat.node_tree.nodes
+    name = mat.get(PAINT_NODE_KEY)
+    if name:
+        node = nodes.get(name)
+        if node is not None and node.type == "TEX_IMAGE":
+            return node
+    for node in nodes:
+        if node.type == "TEX_IMAGE":
+            mat[PAINT_NODE_KEY] = node.name
+            return node
+    return None
+
+
+# Paint canvases up to this edge length are packed as soon as they are
+# created.  Larger ones are packed right before the .blend is saved, so
+# initialization does not stall on copying a multi-hundred-MB float buffer.
+PACK_IMMEDIATE_MAX_SIZE = 2048
+DEFERRED_PACK_KEY = "3mf_pack_on_save"
+
+
+def _pack_paint_image(image, texture_size):
+    """Pack a new paint canvas now, or mark it for packing on save."""
+    if texture_size <= PACK_IMMEDIATE_MAX_SIZE:
+        image.pack()
+    else:
+        image[DEFERRED_PACK_KEY] = True
+
+
+@bpy.app.handlers.persistent
+def _pack_deferred_paint_images(*_args):
+    """``save_pre`` handler: pack canvases whose packing was deferred."""
+    for image in bpy.data.images:
+        if not image.get(DEFERRED_PACK_KEY):
+            continue
+        try:
+            if image.packed_file is None:
+                image.pack()
+            del image[DEFERRED_PACK_KEY]
+        except Exception as e:
+            warn(f"Could not pack paint texture '{image.name}': {e}")
+
+
+def _filament_colors_array(filaments):
+    """Return the ``color`` of every item in *filaments* as an (N, 3) float32 array.
+
+    Reads the whole collection with one ``foreach_get`` instead of one RNA
+    lookup per item.
+    """
+    colors = np.empty(len(filaments) * 3, dtype=np.float32)
+    filaments.foreach_get("color", colors)
+    return colors.reshape(-1, 3)
+
+
+def _read_image_pixels(image):
+    """Read *image* into a fresh C-contiguous (height, width, 4) float32 array."""
+    width, height = image.size
+    pixels = np.empty((height, width, 4), dtype=np.float32)
+    image.pixels.foreach_get(pixels.reshape(-1))
+    return pixels
+
+
+def _write_image_pixels(image, pixels):
+    """Write a (height, width, 4) float32 array back to *image* and queue a refresh."""
+    image.pixels.foreach_set(pixels.reshape(-1))
+    _schedule_image_update(image)
+
+
+# Names of images whose GPU texture is refreshed by the next
+# _flush_image_updates run, so back-to-back palette edits upload once.
+_pending_image_updates = set()
+_IMAGE_UPDATE_DELAY = 0.05
+
+
+def _flush_image_updates():
+    """Timer callback: refresh every image queued by _schedule_image_update."""
+    names = tuple(_pending_image_updates)
+    _pending_image_updates.clear()
+    for name in names:
+        image = bpy.data.images.get(name)
+        if image is not None:
+            image.update()
+    return None  # One-shot timer
+
+
+def _schedule_image_update(image):
+    """Queue ``image.update()`` for *image*, coalescing rapid repeated edits."""
+    _pending_image_updates.add(image.name)
+    if not bpy.app.timers.is_registered(_flush_image_updates):
+        bpy.app.timers.register(_flush_image_updates, first_interval=_IMAGE_UPDATE_DELAY)
+
+
+# Pixels within this distance of a filament color (per channel) are
+# treated as painted with that filament.
+COLOR_MATCH_TOLERANCE = 3.0 / 255.0
+
+
+def _color_match_mask(pixels, rgb, tolerance=COLOR_MATCH_TOLERANCE):
+    """Return an (h, w) bool mask of *pixels* whose RGB lies within *tolerance* of *rgb*.
+
+    Compares one channel at a time through reused (h, w) scratch arrays
+    rather than materialising an (h, w, 3) difference and reducing it, and
+    stops as soon as no pixel is left in the running mask.
+    """
+    tolerance = np.float32(tolerance)
+    diff = np.empty(pixels.shape[:2], dtype=np.float32)
+    hit = np.empty(pixels.shape[:2], dtype=bool)
+    mask = np.empty(pixels.shape[:2], dtype=bool)
+    for channel in range(3):
+        np.subtract(pixels[..., channel], np.float32(rgb[channel]), out=diff)
+        np.abs(diff, out=diff)
+        np.less(diff, tolerance, out=hit if channel else mask)
+        if channel:
+            mask &= hit
+        if not mask.any():
+            break
+    return mask
+
+
+# Swatch changes smaller than this are treated as no change at all, so the
+# canvas is not rescanned for them.
+SWATCH_EPSILON = 0.002
+
+
+# Pixels handled per block by _replace_color: small enough that the
+# per-block mask and scratch arrays stay cache-resident.
+_REPLACE_BLOCK_PIXELS = 1 << 16
+
+
+def _replace_color(pixels, old_rgb, new_rgb, tolerance=COLOR_MATCH_TOLERANCE):
+    """Recolor, in place, every pixel within *tolerance* of *old_rgb* to *new_rgb*.
+
+    Works through blocks of rows so matching, counting and the masked store
+    happen while a block is still in cache, and no full-canvas mask is
+    allocated.  Alpha is left untouched.  Returns the number of pixels
+    changed.
+    """
+    new_arr = np.array(new_rgb[:3], dtype=np.float32)
+    height, width = pixels.shape[:2]
+    rows = max(1, _REPLACE_BLOCK_PIXELS // max(width, 1))
+    changed = 0
+    for start in range(0, height, rows):
+        block = pixels[start:start + rows]
+        mask = _color_match_mask(block, old_rgb, tolerance)
+        count = int(np.count_nonzero(mask))
+        if count:
+            block[mask, :3] = new_arr
+            changed += count
+    return changed
+
+
 def _get_paint_mesh(context):
     """Return the active mesh if it has MMU paint data, else None."""
     obj = context.active_object
@@ -205,15 +380,18 @@ def _sync_filaments_from_mesh(context):
     # dynamically below from settings.mixed_filaments, which avoids duplicate
     # slots and ensures num_physical_filaments is set correctly.
     stored_num_physical = int(mesh.get("3mf_num_physical_filaments", 0))
-    for idx in sorted(colors_dict.keys()):
-        if stored_num_physical > 0 and int(idx) >= stored_num_physical:
-            break  # Stop at the physical/virtual boundary
-        item = settings.filaments.add()
-        item.index = idx
-        item.name = f"Filament {idx + 1}"
-        hex_col = colors_dict[idx]
-        rgb = _rgb_from_hex(hex_col)
-        item.color = rgb
+    physical = sorted(colors_dict.keys())
+    if stored_num_physical > 0:
+        # Stop at the physical/virtual boundary
+        physical = [idx for idx in physical if int(idx) < stored_num_physical]
+    for idx in physical:
+        settings.filaments.add().name = f"Filament {idx + 1}"
+    if physical:
+        # Indices and colors go in with one foreach_set each; names are
+        # strings and have to be set per item above.
+        settings.filaments.foreach_set("index", np.array(physical, dtype=np.int32))
+        rgbs = np.array([_rgb_from_hex(colors_dict[idx]) for idx in physical], dtype=np.float32)
+        settings.filaments.foreach_set("color", rgbs.ravel())
 
     # Append virtual (mixed) filament slots after the physical ones.
     # They are marked is_virtual=True so the main palette UIList can hide them;
@@ -258,11 +436,15 @@ def _write_colors_to_mesh(context):
         if settings.num_physical_filaments > 0
         else sum(1 for f in settings.filaments if not f.is_virtual)
     )
-    colors_dict = {}
-    for i, item in enumerate(settings.filaments):
-        if i >= num_physical:
-            break
-        colors_dict[item.index] = _hex_from_rgb(*item.color)
+    filaments = settings.filaments
+    count = min(num_physical, len(filaments))
+    indices = np.empty(len(filaments), dtype=np.int32)
+    filaments.foreach_get("index", indices)
+    colors = _filament_colors_array(filaments)
+    colors_dict = {
+        index: _hex_from_rgb(*rgb)
+        for index, rgb in zip(indices[:count].tolist(), colors[:count].tolist())
+    }
     mesh["3mf_paint_extruder_colors"] = str(colors_dict)
     mesh["3mf_num_physical_filaments"] = num_physical
 
@@ -349,6 +531,11 @@ def _configure_paint_brush(context):
     return brush
 
 
+def _color_differs(current, rgb, eps=1e-6):
+    """Return True if the stored RGB *current* differs from *rgb* by more than *eps*."""
+    return any(abs(c - v) > eps for c, v in zip(current, rgb))
+
+
 def _set_brush_color(context, color_rgb):
     """Set the active texture paint brush color to the given (r, g, b) sRGB tuple.
 
@@ -381,22 +568,31 @@ def _set_brush_color(context, color_rgb):
         return
 
     try:
+        # Each color write notifies the UI, so only write (and redraw) when
+        # the stored color actually differs -- re-selecting the active
+        # filament is then free.
+        changed = False
+
         # 1. Set brush color (used when unified color is OFF)
-        brush.color = linear_rgb
+        if _color_differs(brush.color, linear_rgb):
+            brush.color = linear_rgb
+            changed = True
 
         # 2. Set unified paint settings color (used when unified color is ON)
         # This is the key - most users have "Unified Color" enabled by default
         # ts.image_paint is the Paint settings object with unified_paint_settings
         ups = ts.image_paint.unified_paint_settings
-        if ups:
+        if ups and _color_differs(ups.color, linear_rgb):
             # ALWAYS set the unified color - this is what actually controls the paint color
             # when "use_unified_color" is enabled (which is the default)
             ups.color = linear_rgb
+            changed = True
 
         # 3. Force UI refresh to show the new color
-        for area in context.screen.areas:
-            if area.type == "VIEW_3D":
-                area.tag_redraw()
+        if changed:
+            for area in context.screen.areas:
+                if area.type == "VIEW_3D":
+                    area.tag_redraw()
 
     except Exception:
         pass
@@ -16,24 +16,67 @@ Texture Paint mode (``bl_context = "imagepaint"``).  Contains two UIList
 subclasses and the panel's draw logic.
 
 Also registers the depsgraph handler that auto-syncs the palette when the
-active object changes.
+active object changes, and the save handler that packs large paint canvases.
 """
 
+import collections
+
 import bpy
 import bpy.types
 
 from .helpers import (
-    _get_paint_mesh,
     _sync_filaments_from_mesh,
     _has_vertex_colors,
+    _pack_deferred_paint_images,
+    _flush_image_updates,
     draw_add_mix_form,
 )
 
 
+# ===================================================================
+#  Panel state cache
+# ===================================================================
+
+_PanelState = collections.namedtuple(
+    "_PanelState", ["is_paint", "has_mats", "has_vcol", "has_seam", "has_support"]
+)
+
+# (object name, mesh name) -> _PanelState.  Panels redraw on almost every
+# mouse move, so the mesh probes are done once and reused until the
+# depsgraph handler or a layer-changing operator invalidates them.
+_panel_draw_cache = {}
+
+
+def _panel_state(context):
+    """Return the cached :class:`_PanelState` for the active mesh object."""
+    obj = context.active_object
+    key = (obj.name, obj.data.name)
+    state = _panel_draw_cache.get(key)
+    if state is None:
+        mesh = obj.data
+        state = _PanelState(
+            is_paint=bool(mesh.get("3mf_is_paint_texture")),
+            has_mats=bool(mesh.materials and mesh.materials[0]),
+            has_vcol=_has_vertex_colors(obj),
+            has_seam=bool(mesh.get("3mf_has_seam_paint", False)),
+            has_support=bool(mesh.get("3mf_has_support_paint", False)),
+        )
+        _panel_draw_cache[key] = state
+    return state
+
+
+def _invalidate_panel_state():
+    """Drop all cached panel state so the next redraw re-probes the mesh."""
+    _panel_draw_cache.clear()
+
+
 # ===================================================================
 #  UILists
 # ===================================================================
 
+# Width of the color swatch column as a fraction of the list row.
+_SWATCH_FACTOR = 0.25
+
 
 class MMU_UL_init_filaments(bpy.types.UIList):
     """Two-column initialization filament list: color picker + name."""
@@ -42,13 +85,10 @@ class MMU_UL_init_filaments(bpy.types.UIList):
         self, context, layout, data, item, icon, active_data, active_property, index
     ):
         if self.layout_type in {"DEFAULT", "COMPACT"}:
-            row = layout.row(align=True)
-            # Editable color swatch column
-            swatch = row.row()
-            swatch.ui_units_x = 1.5
-            swatch.prop(item, "color", text="")
-            # Wider name column
-            row.label(text=item.name)
+            # Editable color swatch column + wider name column
+            split = layout.split(factor=_SWATCH_FACTOR, align=True)
+            split.prop(item, "color", text="")
+            split.label(text=item.name)
         elif self.layout_type == "GRID":
             layout.alignment = "CENTER"
             layout.prop(item, "color", text="")
@@ -61,14 +101,13 @@ class MMU_UL_filaments(bpy.types.UIList):
         self, context, layout, data, item, icon, active_data, active_property, index
     ):
         if self.layout_type in {"DEFAULT", "COMPACT"}:
-            row = layout.row(align=True)
+            split = layout.split(factor=_SWATCH_FACTOR, align=True)
             # Skinny color swatch column (read-only display)
-            swatch = row.row()
-            swatch.ui_units_x = 1.5
+            swatch = split.row()
             swatch.enabled = False  # Make read-only
             swatch.prop(item, "color", text="")
             # Wider name column
-            row.label(text=item.name)
+            split.label(text=item.name)
         elif self.layout_type == "GRID":
             layout.alignment = "CENTER"
             layout.prop(item, "color", text="")
@@ -95,6 +134,21 @@ class MMU_UL_filaments(bpy.types.UIList):
 # ===================================================================
 
 
+# Narrowest sidebar (in pixels) for which the full panel is laid out.
+_MIN_DRAW_WIDTH = 64
+
+# Paint layer selector: (layer type, label, label before init, icon,
+# _PanelState flag that marks the layer as initialized).
+_LAYER_BUTTONS = (
+    ("COLOR", "Color", "Color", "BRUSHES_ALL", None),
+    ("SEAM", "Seam", "Init Seam", "MOD_EDGESPLIT", "has_seam"),
+    ("SUPPORT", "Support", "Init Support", "MOD_LATTICE", "has_support"),
+)
+_AUX_PAINT_LABELS = {"SEAM": "Seam Paint", "SUPPORT": "Support Paint"}
+# Enforce / Block brush buttons: (label, depress, mode).
+_AUX_BUTTONS = (("Enforce", True, "ENFORCE"), ("Block", False, "BLOCK"))
+
+
 class VIEW3D_PT_mmu_paint(bpy.types.Panel):
     """MMU Paint Suite — multi-filament texture painting for 3MF export."""
 
@@ -112,10 +166,17 @@ class VIEW3D_PT_mmu_paint(bpy.types.Panel):
 
     def draw(self, context):
         layout = self.layout
+        # A sidebar squeezed to a sliver cannot show any of the controls;
+        # skip the mesh probes and layout work entirely.
+        region = context.region
+        if region is not None and region.width < _MIN_DRAW_WIDTH:
+            layout.label(text=self.bl_label)
+            return
+
         settings = context.scene.mmu_paint
-        mesh = _get_paint_mesh(context)
+        state = _panel_state(context)
 
-        if mesh is None:
+        if not state.is_paint:
             # ============================
             #  STATE A: Uninitialized
             # ============================
@@ -163,10 +224,8 @@ class VIEW3D_PT_mmu_paint(bpy.types.Panel):
                 box.operator("mmu.initialize_painting", icon="PLAY", text="Initialize")
 
                 # Bake to MMU — for procedural/complex materials
-                obj = context.active_object
-                has_mats = obj and obj.data.materials and obj.data.materials[0]
-                has_vcol = obj and _has_vertex_colors(obj)
-                if has_mats or has_vcol:
+                has_mats = state.has_mats
+                if has_mats or state.has_vcol:
                     layout.separator()
                     bake_box = layout.box()
                     bake_box.label(text="From Existing Material", icon="RENDER_STILL")
@@ -203,45 +262,17 @@ class VIEW3D_PT_mmu_paint(bpy.types.Panel):
             layer_box.label(text="Paint Layer", icon="OUTLINER_DATA_GP_LAYER")
             layer_row = layer_box.row(align=True)
 
-            # Color layer button
-            op = layer_row.operator(
-                "mmu.switch_paint_layer", text="Color",
-                icon="BRUSHES_ALL",
-                depress=(active_layer == "COLOR"),
-            )
-            op.layer_type = "COLOR"
-
-            # Seam layer button
-            has_seam = mesh.get("3mf_has_seam_paint", False)
-            if has_seam:
-                op = layer_row.operator(
-                    "mmu.switch_paint_layer", text="Seam",
-                    icon="MOD_EDGESPLIT",
-                    depress=(active_layer == "SEAM"),
-                )
-                op.layer_type = "SEAM"
-            else:
-                op = layer_row.operator(
-                    "mmu.init_auxiliary_paint", text="Init Seam",
-                    icon="MOD_EDGESPLIT",
-                )
-                op.layer_type = "SEAM"
-
-            # Support layer button
-            has_support = mesh.get("3mf_has_support_paint", False)
-            if has_support:
-                op = layer_row.operator(
-                    "mmu.switch_paint_layer", text="Support",
-                    icon="MOD_LATTICE",
-                    depress=(active_layer == "SUPPORT"),
-                )
-                op.layer_type = "SUPPORT"
-            else:
-                op = layer_row.operator(
-                    "mmu.init_auxiliary_paint", text="Init Support",
-                    icon="MOD_LATTICE",
-                )
-                op.layer_type = "SUPPORT"
+            for layer_type, text, init_text, icon, flag in _LAYER_BUTTONS:
+                if flag is None or getattr(state, flag):
+                    op = layer_row.operator(
+                        "mmu.switch_paint_layer", text=text, icon=icon,
+                        depress=(active_layer == layer_type),
+                    )
+                else:
+                    op = layer_row.operator(
+                        "mmu.init_auxiliary_paint", text=init_text, icon=icon,
+                    )
+                op.layer_type = layer_type
 
             if active_layer == "COLOR":
                 # --- Filament list (color layer only) ---
@@ -270,28 +301,15 @@ class VIEW3D_PT_mmu_paint(bpy.types.Panel):
 
             else:
                 # --- Seam / Support layer palette ---
-                from .helpers import _layer_colors
-                bg, enforce, block = _layer_colors(active_layer)
-                label = active_layer.title()
-
                 box = layout.box()
-                box.label(text=f"{label} Paint", icon="BRUSH_DATA")
+                box.label(text=_AUX_PAINT_LABELS[active_layer], icon="BRUSH_DATA")
 
-                # Enforce / Block color swatches
+                # Enforce / Block brush buttons
                 row = box.row(align=True)
-                enforce_btn = row.operator(
-                    "mmu.switch_aux_brush", text="Enforce",
-                    depress=True,
-                )
-                enforce_btn.layer_type = active_layer
-                enforce_btn.mode = "ENFORCE"
-
-                block_btn = row.operator(
-                    "mmu.switch_aux_brush", text="Block",
-                    depress=False,
-                )
-                block_btn.layer_type = active_layer
-                block_btn.mode = "BLOCK"
+                for text, depress, mode in _AUX_BUTTONS:
+                    btn = row.operator("mmu.switch_aux_brush", text=text, depress=depress)
+                    btn.layer_type = active_layer
+                    btn.mode = mode
 
                 info = box.column(align=True)
                 info.scale_y = 0.7
@@ -301,12 +319,9 @@ class VIEW3D_PT_mmu_paint(bpy.types.Panel):
             # --- Brush falloff warning ---
             brush = context.tool_settings.image_paint.brush
             if brush:
-                is_constant = False
-                try:
-                    is_constant = brush.curve_distance_falloff_preset == "CONSTANT"
-                except AttributeError:
-                    pass
-
+                is_constant = (
+                    getattr(brush, "curve_distance_falloff_preset", "CONSTANT") == "CONSTANT"
+                )
                 if not is_constant:
                     warn_box = layout.box()
                     warn_box.alert = True
@@ -343,11 +358,10 @@ class MMU_UL_mixed_filaments(bpy.types.UIList):
         self, context, layout, data, item, icon, active_data, active_property, index
     ):
         if self.layout_type in {"DEFAULT", "COMPACT"}:
-            row = layout.row(align=True)
+            row = layout.split(factor=_SWATCH_FACTOR, align=True)
 
             # Blended color swatch (read-only)
             swatch = row.row()
-            swatch.ui_units_x = 1.5
             swatch.enabled = False
             swatch.prop(item, "display_color", text="")
 
@@ -501,22 +515,92 @@ class VIEW3D_PT_mmu_mix_colors(bpy.types.Panel):
 # ===================================================================
 
 _last_active_object_name = ""
+_sync_timer_armed = False
 
+# Delay before re-syncing the palette after an object switch.  Bursts of
+# depsgraph updates (playback, undo, rapid clicking) collapse into one sync.
+_SYNC_DELAY = 0.05
 
-def _on_depsgraph_update(scene, depsgraph=None):
-    """Re-sync the panel palette when the active object changes."""
-    global _last_active_object_name
 
+def _flush_filament_sync():
+    """Timer callback: re-sync the palette for the current active object."""
+    global _sync_timer_armed
+
+    _sync_timer_armed = False
     try:
         ctx = bpy.context
         obj = ctx.active_object
+        if obj and obj.type == "MESH":
+            ctx.scene.mmu_paint.loaded_mesh_name = ""  # Force resync
+            _sync_filaments_from_mesh(ctx)
+    except Exception:
+        pass  # Silently ignore context errors during undo/redo/render
+    return None  # One-shot timer
+
+
+def _on_depsgraph_update(scene, depsgraph=None):
+    """Schedule a palette re-sync when the active object changes.
+
+    Also drops the cached panel state, and cached material scans once
+    materials, node trees, images or meshes have been edited.
+    """
+    global _last_active_object_name, _sync_timer_armed
+
+    _invalidate_panel_state()
+    try:
+        if depsgraph is not None and any(
+            depsgraph.id_type_updated(id_type)
+            for id_type in ("MATERIAL", "NODETREE", "IMAGE", "MESH")
+        ):
+            from .color_detection import _clear_material_source_cache
+            _clear_material_source_cache()
+
+        obj = bpy.context.active_object
         current_name = obj.name if obj else ""
 
         if current_name != _last_active_object_name:
             _last_active_object_name = current_name
-            if obj and obj.type == "MESH":
-                settings = scene.mmu_paint
-                settings.loaded_mesh_name = ""  # Force resync
-                _sync_filaments_from_mesh(ctx)
+            if not _sync_timer_armed:
+                bpy.app.timers.register(
+                    _flush_filament_sync, first_interval=_SYNC_DELAY,
+                )
+                _sync_timer_armed = True
     except Exception:
         pass  # Silently ignore context errors during undo/redo/render
+
+
+# ===================================================================
+#  Registration
+# ===================================================================
+
+_panel_classes = (
+    MMU_UL_init_filaments,
+    MMU_UL_filaments,
+    MMU_UL_mixed_filaments,
+    VIEW3D_PT_mmu_paint,
+    VIEW3D_PT_mmu_mix_colors,
+)
+
+
+def register():
+    for cls in _panel_classes:
+        bpy.utils.register_class(cls)
+    bpy.app.handlers.depsgraph_update_post.append(_on_depsgraph_update)
+    bpy.app.handlers.save_pre.append(_pack_deferred_paint_images)
+
+
+def unregister():
+    global _sync_timer_armed
+
+    if _on_depsgraph_update in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(_on_depsgraph_update)
+    if _pack_deferred_paint_images in bpy.app.handlers.save_pre:
+        bpy.app.handlers.save_pre.remove(_pack_deferred_paint_images)
+    if bpy.app.timers.is_registered(_flush_filament_sync):
+        bpy.app.timers.unregister(_flush_filament_sync)
+    _sync_timer_armed = False
+    if bpy.app.timers.is_registered(_flush_image_updates):
+        bpy.app.timers.unregister(_flush_image_updates)
+        _flush_image_updates()
+    for cls in reversed(_panel_classes):
+        bpy.utils.unregister_class(cls)
@@ -27,22 +27,53 @@ from ..common.logging import debug, warn
 
 from .helpers import (
     DEFAULT_PALETTE,
+    PAINT_NODE_KEY,
+    SWATCH_EPSILON,
     _get_paint_image,
     _get_paint_mesh,
     _sync_filaments_from_mesh,
     _write_colors_to_mesh,
+    _pack_paint_image,
+    _filament_colors_array,
+    _read_image_pixels,
+    _replace_color,
+    _find_paint_texture_node,
+    _write_image_pixels,
     _configure_paint_brush,
     _set_brush_color,
+    _color_differs,
     _has_vertex_colors,
     _refresh_virtual_slots_in_palette,
 )
-from .color_detection import (
-    _collect_material_colors,
-    _get_any_image_texture,
-    _has_color_attribute_node,
-    _extract_texture_colors,
-    _extract_vertex_colors,
-)
+from .mmu_panel import _invalidate_panel_state
+
+# DEFAULT_PALETTE as a float32 table, ready for foreach_set on color collections.
+_PALETTE_F32 = np.asarray(DEFAULT_PALETTE, dtype=np.float32)
+_PALETTE_LEN = len(_PALETTE_F32)
+
+
+def _select_all_mesh_data(mesh):
+    """Select every vertex, edge and face directly on the mesh data.
+
+    Edit Mode picks the flags up on entry, which saves the
+    ``bpy.ops.mesh.select_all`` round-trip before a UV unwrap.
+    """
+    for elements in (mesh.vertices, mesh.edges, mesh.polygons):
+        elements.foreach_set("select", np.ones(len(elements), dtype=bool))
+
+
+def _fill_paint_image(image, rgb):
+    """Fill *image* with the opaque color *rgb*.
+
+    One RGBA row is broadcast over a flat buffer in a single write pass.
+    ``foreach_set`` has no offset argument, so the buffer has to span the
+    whole image; keeping it local to this helper releases it (1 GiB at
+    8192x8192) before the caller goes on to pack the image and switch modes.
+    """
+    width, height = image.size
+    fill = np.empty(width * height * 4, dtype=np.float32)
+    fill.reshape(-1, 4)[:] = (rgb[0], rgb[1], rgb[2], 1.0)
+    image.pixels.foreach_set(fill)
 
 
 # ===================================================================
@@ -124,8 +155,8 @@ class MMU_OT_initialize(bpy.types.Operator):
                 bm.free()
                 mesh.update()
 
+            _select_all_mesh_data(mesh)
             bpy.ops.object.mode_set(mode="EDIT")
-            bpy.ops.mesh.select_all(action="SELECT")
 
             if uv_method == "LIGHTMAP":
                 bpy.ops.uv.lightmap_pack(
@@ -157,22 +188,17 @@ class MMU_OT_initialize(bpy.types.Operator):
         else:
             texture_size = 8192
 
-        # Get base color from first init filament
-        base_color = tuple(settings.init_filaments[0].color[:])
+        # Base color from the first init filament; _fill_paint_image reads
+        # the three channels straight off the RNA array.
+        base_color = settings.init_filaments[0].color
 
         # --- Create image filled with base color ---
         image_name = f"{mesh.name}_MMU_Paint"
         image = bpy.data.images.new(
             image_name, width=texture_size, height=texture_size, alpha=True
         )
-        # Fill entire image with base color
-        fill = np.empty((texture_size, texture_size, 4), dtype=np.float32)
-        fill[:, :, 0] = base_color[0]
-        fill[:, :, 1] = base_color[1]
-        fill[:, :, 2] = base_color[2]
-        fill[:, :, 3] = 1.0
-        image.pixels.foreach_set(fill.ravel())
-        image.pack()
+        _fill_paint_image(image, base_color)
+        _pack_paint_image(image, texture_size)
 
         # --- Material setup ---
         mat = bpy.data.materials.new(name=image_name)
@@ -199,29 +225,29 @@ class MMU_OT_initialize(bpy.types.Operator):
         mesh.materials.append(mat)
         num_faces = len(mesh.polygons)
         if num_faces > 0:
-            material_indices = [0] * num_faces
-            mesh.polygons.foreach_set("material_index", material_indices)
+            mesh.polygons.foreach_set(
+                "material_index", np.zeros(num_faces, dtype=np.int32)
+            )
 
         # --- Build palette from init_filaments ---
-        colors_dict = {}
-        for i, item in enumerate(settings.init_filaments):
-            colors_dict[i] = _hex_from_rgb(*item.color[:])
+        colors_dict = {
+            i: _hex_from_rgb(*item.color[:3])
+            for i, item in enumerate(settings.init_filaments)
+        }
 
         # --- Store custom properties ---
         mesh["3mf_is_paint_texture"] = True
         mesh["3mf_paint_default_extruder"] = 1  # 1-based
         mesh["3mf_paint_extruder_colors"] = str(colors_dict)
+        _invalidate_panel_state()
 
         # --- Populate panel filaments ---
         settings.loaded_mesh_name = ""  # Force reload
         _sync_filaments_from_mesh(context)
 
         # Set active node so texture paint knows which image to paint on
-        if mat.node_tree:
-            for node in mat.node_tree.nodes:
-                if node.type == "TEX_IMAGE":
-                    mat.node_tree.nodes.active = node
-                    break
+        nodes.active = tex_node
+        mat[PAINT_NODE_KEY] = tex_node.name
 
         # Switch to Texture Paint mode FIRST -- ts.image_paint / brush
         # are not reliably available until we're in paint mode.
@@ -264,11 +290,8 @@ class MMU_OT_add_init_filament(bpy.types.Operator):
         item = settings.init_filaments.add()
         item.name = f"Filament {idx + 1}"
 
-        # Pick color from palette
-        if idx < len(DEFAULT_PALETTE):
-            item.color = DEFAULT_PALETTE[idx]
-        else:
-            item.color = DEFAULT_PALETTE[idx % len(DEFAULT_PALETTE)]
+        # Pick color from palette, wrapping past the last entry
+        item.color = DEFAULT_PALETTE[idx % _PALETTE_LEN]
 
         return {"FINISHED"}
 
@@ -282,24 +305,31 @@ class MMU_OT_remove_init_filament(bpy.types.Operator):
 
     def execute(self, context):
         settings = context.scene.mmu_paint
+        filaments = settings.init_filaments
+        count = len(filaments)
 
-        if len(settings.init_filaments) <= 2:
+        if count <= 2:
             self.report({"ERROR"}, "Minimum 2 filaments required")
             return {"CANCELLED"}
 
         idx = settings.active_init_filament_index
-        if idx < 0 or idx >= len(settings.init_filaments):
+        if not 0 <= idx < count:
             return {"CANCELLED"}
 
-        settings.init_filaments.remove(idx)
+        filaments.remove(idx)
+        count -= 1
 
-        # Rename remaining filaments
-        for i, item in enumerate(settings.init_filaments):
-            item.name = f"Filament {i + 1}"
+        # Rename the filaments that shifted down; earlier entries keep
+        # their position and name.
+        for i in range(idx, count):
+            item = filaments[i]
+            new_name = f"Filament {i + 1}"
+            if item.name != new_name:
+                item.name = new_name
 
         # Clamp selection
-        if settings.active_init_filament_index >= len(settings.init_filaments):
-            settings.active_init_filament_index = len(settings.init_filaments) - 1
+        if idx >= count:
+            settings.active_init_filament_index = count - 1
 
         return {"FINISHED"}
 
@@ -315,11 +345,10 @@ class MMU_OT_reset_init_filaments(bpy.types.Operator):
         settings = context.scene.mmu_paint
         settings.init_filaments.clear()
 
-        # Create default 4 filaments
+        # Create default 4 filaments, colored in one foreach_set
         for i in range(4):
-            item = settings.init_filaments.add()
-            item.name = f"Filament {i + 1}"
-            item.color = DEFAULT_PALETTE[i]
+            settings.init_filaments.add().name = f"Filament {i + 1}"
+        settings.init_filaments.foreach_set("color", _PALETTE_F32[:4].ravel())
 
         settings.active_init_filament_index = 0
         return {"FINISHED"}
@@ -358,19 +387,19 @@ class MMU_OT_detect_material_colors(bpy.types.Operator):
         if obj.data.get("3mf_is_paint_texture"):
             return False
         # Allow if object has materials OR vertex colors
-        has_materials = bool(obj.data.materials)
-        has_vertex = (
-            hasattr(obj.data, "color_attributes")
-            and len(obj.data.color_attributes) > 0
-        )
-        return has_materials or has_vertex
+        return bool(obj.data.materials) or _has_vertex_colors(obj)
 
     def invoke(self, context, event):
+        from .color_detection import _material_sources
+
         obj = context.active_object
 
-        # Check for image texture on active material
-        image = _get_any_image_texture(obj)
-        debug(f"[Detect] _get_any_image_texture -> {image}")
+        # One cached walk of the material nodes answers both the image
+        # texture and the Color Attribute node question.
+        image, has_ca_node = (
+            _material_sources(obj) if obj.data.materials else (None, False)
+        )
+        debug(f"[Detect] image texture -> {image}")
         if image is not None:
             self._source = "IMAGE"
             debug(f"[Detect] Source = IMAGE, image = '{image.name}' ({image.size[0]}x{image.size[1]})")
@@ -381,8 +410,7 @@ class MMU_OT_detect_material_colors(bpy.types.Operator):
         # Check for vertex colors -- either via color attributes on the
         # mesh or a Color Attribute node feeding a Principled BSDF
         has_vc = _has_vertex_colors(obj)
-        has_ca_node = _has_color_attribute_node(obj)
-        debug(f"[Detect] _has_vertex_colors -> {has_vc}, _has_color_attribute_node -> {has_ca_node}")
+        debug(f"[Detect] _has_vertex_colors -> {has_vc}, color attribute node -> {has_ca_node}")
         if has_vc or has_ca_node:
             self._source = "VERTEX"
             debug("[Detect] Source = VERTEX")
@@ -406,6 +434,13 @@ class MMU_OT_detect_material_colors(bpy.types.Operator):
         layout.prop(self, "num_colors", slider=True)
 
     def execute(self, context):
+        from .color_detection import (
+            _collect_material_colors,
+            _get_any_image_texture,
+            _extract_texture_colors,
+            _extract_vertex_colors,
+        )
+
         obj = context.active_object
         settings = context.scene.mmu_paint
         debug(f"[Detect] execute() _source={self._source}, num_colors={self.num_colors}")
@@ -450,12 +485,13 @@ class MMU_OT_detect_material_colors(bpy.types.Operator):
         settings.active_init_filament_index = 0
         self.report({"INFO"}, f"Detected {len(colors)} colors from {source_label}")
 
-        # Force panel redraw so the color swatches update immediately
+        # Redraw only the sidebars that show the palette (3D Viewport and
+        # Shader Editor) so the color swatches update immediately
         for area in context.screen.areas:
-            if area.type == "VIEW_3D":
-                area.tag_redraw()
-            elif area.type == "PROPERTIES":
-                area.tag_redraw()
+            if area.type in {"VIEW_3D", "NODE_EDITOR"}:
+                for region in area.regions:
+                    if region.type == "UI":
+                        region.tag_redraw()
 
         return {"FINISHED"}
 
@@ -521,7 +557,7 @@ class MMU_OT_add_filament(bpy.types.Operator):
             settings.filaments.remove(len(settings.filaments) - 1)
 
         new_index = num_physical
-        new_color = DEFAULT_PALETTE[new_index % len(DEFAULT_PALETTE)]
+        new_color = DEFAULT_PALETTE[new_index % _PALETTE_LEN]
 
         item = settings.filaments.add()
         item.index = new_index
@@ -593,38 +629,34 @@ class MMU_OT_remove_filament(bpy.types.Operator):
         else:
             new_base_color = tuple(settings.filaments[0].color[:])
 
-        # Replace all pixels of the removed color with the new base color
-        obj = context.active_object
-        image = _get_paint_image(obj)
+        # Replace all pixels of the removed color with the new base color.
+        # Nothing to repaint when the removed color is the new base color;
+        # skip looking up and reading the canvas altogether.  Near matches
+        # still recolor, so no pixels drift outside the match tolerance.
         replaced_count = 0
+        image = None
+        if _color_differs(removed_color, new_base_color, SWATCH_EPSILON):
+            image = _get_paint_image(context.active_object)
 
         if image is not None:
-            w, h = image.size
-            pixels_flat = np.empty(w * h * 4, dtype=np.float32)
-            image.pixels.foreach_get(pixels_flat)
-            pixels = pixels_flat.reshape(h, w, 4)
-
-            old_arr = np.array(removed_color, dtype=np.float32)
-            new_arr = np.array(new_base_color, dtype=np.float32)
-
-            tolerance = 3.0 / 255.0
-            mask = np.all(np.abs(pixels[:, :, :3] - old_arr) < tolerance, axis=2)
-            replaced_count = int(np.count_nonzero(mask))
-
+            pixels = _read_image_pixels(image)
+            replaced_count = _replace_color(pixels, removed_color, new_base_color)
             if replaced_count > 0:
-                pixels[mask, 0] = new_arr[0]
-                pixels[mask, 1] = new_arr[1]
-                pixels[mask, 2] = new_arr[2]
-                image.pixels.foreach_set(pixels.ravel())
-                image.update()
+                _write_image_pixels(image, pixels)
 
         settings.filaments.remove(idx)
         num_physical_new = num_physical - 1
 
-        # Re-index physical items only; virtual slots will be rebuilt below.
-        for i in range(min(num_physical_new, len(settings.filaments))):
-            settings.filaments[i].index = i
-            settings.filaments[i].name = f"Filament {i + 1}"
+        # Re-index every slot in one bulk write (virtual slots are rebuilt
+        # below and get the same positional index), then rename only the
+        # physical items that shifted down.
+        count = len(settings.filaments)
+        settings.filaments.foreach_set("index", np.arange(count, dtype=np.int32))
+        for i in range(idx, min(num_physical_new, count)):
+            item = settings.filaments[i]
+            new_name = f"Filament {i + 1}"
+            if item.name != new_name:
+                item.name = new_name
 
         # Clamp selection to physical range
         if settings.active_filament_index >= num_physical_new:
@@ -685,11 +717,9 @@ class MMU_OT_switch_to_paint(bpy.types.Operator):
         # Set active node
         if obj.data.materials:
             mat = obj.data.materials[0]
-            if mat and mat.use_nodes:
-                for node in mat.node_tree.nodes:
-                    if node.type == "TEX_IMAGE":
-                        mat.node_tree.nodes.active = node
-                        break
+            tex_node = _find_paint_texture_node(mat)
+            if tex_node is not None:
+                mat.node_tree.nodes.active = tex_node
 
         # Sync filament palette
         _sync_filaments_from_mesh(context)
@@ -699,13 +729,13 @@ class MMU_OT_switch_to_paint(bpy.types.Operator):
         if len(settings.filaments) > 0:
             _set_brush_color(context, settings.filaments[0].color[:])
 
-        # Try to open the sidebar panel
-        for area in context.screen.areas:
-            if area.type == "VIEW_3D":
-                for space in area.spaces:
-                    if space.type == "VIEW_3D":
-                        space.show_region_ui = True
-                break
+        # Try to open the sidebar panel, preferring the 3D view we ran from
+        space = context.space_data
+        if space is None or space.type != "VIEW_3D":
+            area = next((a for a in context.screen.areas if a.type == "VIEW_3D"), None)
+            space = area.spaces.active if area is not None else None
+        if space is not None:
+            space.show_region_ui = True
 
         return {"FINISHED"}
 
@@ -769,43 +799,27 @@ class MMU_OT_reassign_filament_color(bpy.types.Operator):
             return {"CANCELLED"}
 
         item = settings.filaments[idx]
+        old_rgb = tuple(item.color[:])
+        new_rgb = tuple(self.new_color[:])
+
+        # Skip if colors are identical, before touching the image at all
+        if not _color_differs(old_rgb, new_rgb, SWATCH_EPSILON):
+            return {"CANCELLED"}
+
         obj = context.active_object
         image = _get_paint_image(obj)
         if image is None:
             self.report({"WARNING"}, "No paint texture found")
             return {"CANCELLED"}
 
-        old_rgb = tuple(item.color[:])
-        new_rgb = tuple(self.new_color[:])
-
-        # Skip if colors are identical
-        if all(abs(o - n) < 0.002 for o, n in zip(old_rgb, new_rgb)):
-            return {"CANCELLED"}
-
         # Bulk pixel replacement
-        w, h = image.size
-        pixel_count = w * h * 4
-        pixels_flat = np.empty(pixel_count, dtype=np.float32)
-        image.pixels.foreach_get(pixels_flat)
-        pixels = pixels_flat.reshape(h, w, 4)
-
-        old_arr = np.array(old_rgb, dtype=np.float32)
-        new_arr = np.array(new_rgb, dtype=np.float32)
-
-        tolerance = 3.0 / 255.0
-        mask = np.all(np.abs(pixels[:, :, :3] - old_arr) < tolerance, axis=2)
-
-        num_changed = np.count_nonzero(mask)
+        pixels = _read_image_pixels(image)
+        num_changed = _replace_color(pixels, old_rgb, new_rgb)
         if num_changed == 0:
             self.report({"INFO"}, "No pixels found with the current color")
             return {"CANCELLED"}
 
-        pixels[mask, 0] = new_arr[0]
-        pixels[mask, 1] = new_arr[1]
-        pixels[mask, 2] = new_arr[2]
-
-        image.pixels.foreach_set(pixels.ravel())
-        image.update()
+        _write_image_pixels(image, pixels)
 
         # Update stored color
         item.color = new_rgb
@@ -911,15 +925,15 @@ class MMU_OT_init_auxiliary_paint(bpy.types.Operator):
         if mmu_uv:
             # Copy UV coordinates from the color paint layer
             num_loops = len(mesh.loops)
-            uv_flat = [0.0] * (num_loops * 2)
+            uv_flat = np.empty(num_loops * 2, dtype=np.float32)
             mmu_uv.data.foreach_get("uv", uv_flat)
             uv_layer.data.foreach_set("uv", uv_flat)
         else:
             # No existing UVs — do a fresh unwrap
             mesh.uv_layers.active = uv_layer
             context.view_layer.objects.active = obj
+            _select_all_mesh_data(mesh)
             bpy.ops.object.mode_set(mode="EDIT")
-            bpy.ops.mesh.select_all(action="SELECT")
             bpy.ops.uv.smart_project(
                 angle_limit=1.15192,
                 margin_method="SCALED",
@@ -945,13 +959,8 @@ class MMU_OT_init_auxiliary_paint(bpy.types.Operator):
         image = bpy.data.images.new(
             image_name, width=texture_size, height=texture_size, alpha=True
         )
-        fill = np.empty((texture_size, texture_size, 4), dtype=np.float32)
-        fill[:, :, 0] = bg[0]
-        fill[:, :, 1] = bg[1]
-        fill[:, :, 2] = bg[2]
-        fill[:, :, 3] = 1.0
-        image.pixels.foreach_set(fill.ravel())
-        image.pack()
+        _fill_paint_image(image, bg)
+        _pack_paint_image(image, texture_size)
 
         # Add TEX_IMAGE node to the paint material
         if mesh.materials and mesh.materials[0] and mesh.materials[0].use_nodes:
@@ -969,6 +978,7 @@ class MMU_OT_init_auxiliary_paint(bpy.types.Operator):
             2: _hex_from_rgb(*block),
         }
         mesh[colors_key] = str(color_dict)
+        _invalidate_panel_state()
 
         # Switch to the new layer
         settings.active_paint_layer = layer_type
@@ -1033,7 +1043,7 @@ def _switch_to_layer(context, layer_type):
     image = _get_layer_image(obj, layer_type)
     if not image and layer_type == "COLOR":
         # Fallback: scan for the segmentation image
-        image = _get_paint_image(context)
+        image = _get_paint_image(obj)
 
     if image:
         # Set active TEX_IMAGE node in the material
@@ -1122,11 +1132,12 @@ def _physical_hex_colors(settings) -> list:
     num_virt = sum(1 for m in settings.mixed_filaments if m.enabled and not m.deleted)
     num_physical_live = len(settings.filaments) - num_virt
     if num_physical_live > 0:
-        return [rgb_to_hex(*fi.color[:3]) for fi in settings.filaments[:num_physical_live]]
+        colors = _filament_colors_array(settings.filaments)[:num_physical_live]
+        return [rgb_to_hex(*rgb) for rgb in colors.tolist()]
 
     # Fall back to the init palette used in the bake panel.
     if settings.init_filaments:
-        return [rgb_to_hex(*fi.color[:3]) for fi in settings.init_filaments]
+        return [rgb_to_hex(*rgb) for rgb in _filament_colors_array(settings.init_filaments).tolist()]
 
     return []
 
@@ -1264,7 +1275,6 @@ class MMU_OT_recompute_mix_color(bpy.types.Operator):
         )
 
     def execute(self, context):
-        import numpy as np
         settings = context.scene.mmu_paint
         idx = settings.active_mixed_filament_index
         if not (0 <= idx < len(settings.mixed_filaments)):
@@ -1293,26 +1303,14 @@ class MMU_OT_recompute_mix_color(bpy.types.Operator):
         _set_brush_color(context, new_rgb)
 
         # Reassign pixels in the paint texture (old color → new color)
-        if old_rgb is not None and any(abs(o - n) > 0.002 for o, n in zip(old_rgb, new_rgb)):
+        if old_rgb is not None and _color_differs(old_rgb, new_rgb, SWATCH_EPSILON):
             obj = context.active_object
             image = _get_paint_image(obj)
             if image is not None:
-                w, h = image.size
-                pixels_flat = np.empty(w * h * 4, dtype=np.float32)
-                image.pixels.foreach_get(pixels_flat)
-                pixels = pixels_flat.reshape(h, w, 4)
-
-                old_arr = np.array(old_rgb, dtype=np.float32)
-                new_arr = np.array(new_rgb, dtype=np.float32)
-                tolerance = 3.0 / 255.0
-                mask = np.all(np.abs(pixels[:, :, :3] - old_arr) < tolerance, axis=2)
-                num_changed = int(np.count_nonzero(mask))
+                pixels = _read_image_pixels(image)
+                num_changed = _replace_color(pixels, old_rgb, new_rgb)
                 if num_changed > 0:
-                    pixels[mask, 0] = new_arr[0]
-                    pixels[mask, 1] = new_arr[1]
-                    pixels[mask, 2] = new_arr[2]
-                    image.pixels.foreach_set(pixels.ravel())
-                    image.update()
+                    _write_image_pixels(image, pixels)
                     self.report({"INFO"}, f"Updated mix color; reassigned {num_changed} pixels")
                     return {"FINISHED"}
 
@@ -1595,3 +1593,38 @@ class MMU_OT_cancel_add_mix(bpy.types.Operator):
     def execute(self, context):
         context.scene.mmu_paint.show_add_mix_section = False
         return {"FINISHED"}
+
+
+# ===================================================================
+#  Registration
+# ===================================================================
+
+_operator_classes = (
+    MMU_OT_initialize,
+    MMU_OT_add_init_filament,
+    MMU_OT_remove_init_filament,
+    MMU_OT_reset_init_filaments,
+    MMU_OT_detect_material_colors,
+    MMU_OT_select_filament,
+    MMU_OT_reassign_filament_color,
+    MMU_OT_add_filament,
+    MMU_OT_remove_filament,
+    MMU_OT_fix_falloff,
+    MMU_OT_switch_to_paint,
+    MMU_OT_import_paint_popup,
+    MMU_OT_init_auxiliary_paint,
+    MMU_OT_switch_paint_layer,
+    MMU_OT_switch_aux_brush,
+    MMU_OT_add_mixed_filament,
+    MMU_OT_remove_mixed_filament,
+    MMU_OT_recompute_mix_color,
+    MMU_MT_add_mix_menu,
+    MMU_OT_add_mix_gradient,
+    MMU_OT_add_mix_pattern,
+    MMU_OT_add_mix_by_color,
+    MMU_OT_add_mix_confirm,
+    MMU_OT_cancel_add_mix,
+)
+
+
+register, unregister = bpy.utils.register_classes_factory(_operator_classes)
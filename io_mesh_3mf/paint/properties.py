@@ -421,3 +421,27 @@ class MMUPaintSettings(bpy.types.PropertyGroup):
         description="Repeating layer pattern digits (1=A, 2=B, 3–9=direct slot). E.g. '12', '112'",
         default="12",
     )
+
+
+# ===================================================================
+#  Registration
+# ===================================================================
+
+_property_classes = (
+    MMUMixedFilamentItem,
+    MMUFilamentItem,
+    MMUInitFilamentItem,
+    MMUPaintSettings,
+)
+
+
+def register():
+    for cls in _property_classes:
+        bpy.utils.register_class(cls)
+    bpy.types.Scene.mmu_paint = bpy.props.PointerProperty(type=MMUPaintSettings)
+
+
+def unregister():
+    del bpy.types.Scene.mmu_paint
+    for cls in reversed(_property_classes):
+        bpy.utils.unregister_class(cls)
@@ -29,6 +29,10 @@ import numpy as np
 
 from ..common.logging import debug
 
+# Pixels per row band when _quantize_by_regions writes its palette colors
+# back into the canvas.
+_APPLY_BAND_PIXELS = 1 << 16
+
 
 # ---------------------------------------------------------------------------
 #  Helpers
@@ -1050,18 +1054,26 @@ def _quantize_by_regions(
 
     # Step 5: Apply palette colors via LUT  [85% -> 100%]
     # region_map → palette index → RGB, all in two vectorized lookups
+    # Applied a band of rows at a time so the looked-up colors and the
+    # difference buffer stay cache-sized instead of spanning the canvas.
     palette = np.array(filament_colors, dtype=np.float32)
-    pal_idx_map = region_lut[region_map]  # (H, W) palette indices
-    new_rgb = palette[pal_idx_map]        # (H, W, 3)
-
-    opaque_3d = opaque[:, :, np.newaxis]
-    old_rgb = pixels[:, :, :3]
-    diff = np.any(np.abs(old_rgb - new_rgb) > 0.002, axis=2)
-    changed = int(np.count_nonzero(diff & opaque))
-
-    # Only write opaque pixels (leave transparent background alone)
-    pixels[:, :, :3] = np.where(opaque_3d, new_rgb, old_rgb)
-    changed = int(np.count_nonzero(diff & opaque))
+    rows = max(1, _APPLY_BAND_PIXELS // max(width, 1))
+    changed = 0
+    for start in range(0, height, rows):
+        stop = start + rows
+        new_rgb = palette[region_lut[region_map[start:stop]]]  # (rows, W, 3)
+        old_rgb = pixels[start:stop, :, :3]
+        band_opaque = opaque[start:stop]
+
+        # Largest per-channel difference, with the abs taken in place.
+        delta = old_rgb - new_rgb
+        np.abs(delta, out=delta)
+        diff = delta.max(axis=2) > 0.002
+        diff &= band_opaque
+        changed += int(np.count_nonzero(diff))
+
+        # Only write opaque pixels (leave transparent background alone)
+        np.copyto(old_rgb, new_rgb, where=band_opaque[:, :, np.newaxis])
 
     debug(f"Region quantization: changed {changed} pixels")
     _progress(100)
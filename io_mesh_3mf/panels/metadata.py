@@ -31,33 +31,42 @@ Paint mode where the MMU Paint panel takes over.
 """
 
 import ast
+import json
 
 import bpy
 import bpy.props
 import bpy.types
 import idprop.types
+import numpy as np
 
 
 # ===================================================================
 #  Constants
 # ===================================================================
 
-# Editable 3MF metadata keys shown in Scene Metadata section.
+# Editable 3MF metadata keys shown in Scene Metadata section (display order;
+# only ever iterated, membership goes through the frozensets below).
 _EDITABLE_KEYS = ("Title", "Designer", "Description", "Copyright", "LicenseTerms")
 
-# Read-only date metadata shown in Scene Metadata section.
+# Read-only date metadata shown in Scene Metadata section (display order).
 _SCENE_READONLY_KEYS = ("CreationDate", "ModificationDate")
 
 # Metadata keys displayed in the Slicer Info section instead.
-_SLICER_META_KEYS = {"Application", "BambuStudio:3mfVersion"}
+_SLICER_META_KEYS = frozenset(("Application", "BambuStudio:3mfVersion"))
 
 # Union of all standard/special keys — used to filter custom entries.
-_STANDARD_KEYS = (
-    set(_EDITABLE_KEYS) | set(_SCENE_READONLY_KEYS) | _SLICER_META_KEYS | {"Title"}
-)
+_STANDARD_KEYS = frozenset(_EDITABLE_KEYS + _SCENE_READONLY_KEYS) | _SLICER_META_KEYS
 
 # Read-only keys checked by the add-metadata operator.
-_READONLY_KEYS = set(_SCENE_READONLY_KEYS) | _SLICER_META_KEYS
+_READONLY_KEYS = frozenset(_SCENE_READONLY_KEYS) | _SLICER_META_KEYS
+
+# Slicer name shown for an Application value containing any of the
+# (lowercase) keywords, checked in order.
+_VENDOR_KEYWORDS = (
+    ("Orca / BambuStudio", ("bambu", "orca")),
+    ("PrusaSlicer", ("prusa", "slic3r")),
+    ("Cura", ("cura",)),
+)
 
 # Config stash indicator prefix (matches import_3mf/archive.py).
 _CONFIG_STASH_PREFIX = ".3mf_config/"
@@ -74,67 +83,119 @@ _PART_SUBTYPES = [
 # Mapping from subtype value to display label.
 _SUBTYPE_LABELS = {item[0]: item[1] for item in _PART_SUBTYPES}
 
+# Type of a 3MF metadata entry (resolved once; checked for every ID property
+# on each redraw).
+_IDPropertyGroup = idprop.types.IDPropertyGroup
+
 
 # ===================================================================
 #  Helpers
 # ===================================================================
 
 
-def _get_metadata_value(owner, key):
+def _get_metadata_value(owner, key, props=None):
     """Read a metadata value from a Blender ID (scene/object).
 
+    *props* may be a ``dict(owner.items())`` snapshot to look the key up in
+    instead of going back to the ID.
+
     Returns ``(value_str, is_metadata_entry)`` or ``(None, False)`` if the
     key doesn't hold 3MF metadata.
     """
     if key == "Title":
         return owner.name, True
 
-    entry = owner.get(key)
-    if isinstance(entry, idprop.types.IDPropertyGroup):
-        if "value" in entry.keys() and "datatype" in entry.keys():
-            return str(entry.get("value", "")), True
-    return None, False
+    value = _metadata_entry_value((owner if props is None else props).get(key))
+    return value, value is not None
+
+
+def _metadata_entry_value(entry):
+    """Return the value string of a 3MF metadata property *entry*, or ``None``.
+
+    Metadata entries are ID property groups holding ``value`` and
+    ``datatype``; anything else is not 3MF metadata.
+    """
+    if isinstance(entry, _IDPropertyGroup) and "value" in entry and "datatype" in entry:
+        return str(entry["value"])
+    return None
+
+
+# (text-block count, stashed config names) from the last scan of
+# bpy.data.texts.  Rebuilt when the count changes, and dropped on depsgraph
+# updates and file loads so renamed text blocks are picked up too.
+_stashed_cache = None
 
 
 def _get_stashed_configs():
     """Return a list of stashed slicer config text-block names."""
-    return [t.name for t in bpy.data.texts if t.name.startswith(_CONFIG_STASH_PREFIX)]
+    global _stashed_cache
+    texts = bpy.data.texts
+    if _stashed_cache is None or _stashed_cache[0] != len(texts):
+        names = [t.name for t in texts if t.name.startswith(_CONFIG_STASH_PREFIX)]
+        _stashed_cache = (len(texts), names)
+    return _stashed_cache[1]
+
+
+# Scene pointer -> (Application value, BambuStudio:3mfVersion value, vendor).
+# An entry is only reused while both stored values are unchanged.
+_vendor_cache = {}
 
 
-def _detect_vendor_from_scene(scene):
+def _detect_vendor_from_scene(scene, props=None):
     """Infer slicer vendor from stored scene metadata.
 
-    Returns a human-readable slicer name or ``None``.
+    Returns a human-readable slicer name or ``None``.  The result is cached
+    per scene until either of the two metadata values changes.
     """
-    app_value, _ = _get_metadata_value(scene, "Application")
+    app_value, _ = _get_metadata_value(scene, "Application", props)
+    bambu_ver, _ = _get_metadata_value(scene, "BambuStudio:3mfVersion", props)
+    key = scene.as_pointer()
+    cached = _vendor_cache.get(key)
+    if cached is not None and cached[0] == app_value and cached[1] == bambu_ver:
+        return cached[2]
+    vendor = _vendor_from_metadata(app_value, bambu_ver)
+    _vendor_cache[key] = (app_value, bambu_ver, vendor)
+    return vendor
+
+
+def _vendor_from_metadata(app_value, bambu_ver):
+    """Map the Application / BambuStudio version metadata values to a slicer name."""
     if app_value:
         app_lower = app_value.lower()
-        if "bambu" in app_lower or "orca" in app_lower:
-            return "Orca / BambuStudio"
-        if "prusa" in app_lower or "slic3r" in app_lower:
-            return "PrusaSlicer"
-        if "cura" in app_lower:
-            return "Cura"
+        for vendor, keywords in _VENDOR_KEYWORDS:
+            if any(keyword in app_lower for keyword in keywords):
+                return vendor
         return app_value  # Unknown slicer — show raw value.
 
-    bambu_ver, _ = _get_metadata_value(scene, "BambuStudio:3mfVersion")
     if bambu_ver is not None:
         return "Orca / BambuStudio"
     return None
 
 
+# Mesh pointer -> (raw property string, parsed colors).  An entry is only
+# reused while the stored string is unchanged, so stale pointers are harmless.
+_paint_colors_cache = {}
+
+
 def _parse_paint_colors(mesh):
     """Parse ``3mf_paint_extruder_colors`` from *mesh*.
 
-    Returns ``{index: "#RRGGBB"}`` or empty dict.
+    Returns ``{index: "#RRGGBB"}`` or empty dict.  The parse is cached per
+    mesh and redone only when the stored string changes.
     """
     raw = mesh.get("3mf_paint_extruder_colors", "")
     if not raw:
         return {}
+    key = mesh.as_pointer()
+    cached = _paint_colors_cache.get(key)
+    if cached is not None and cached[0] == raw:
+        return cached[1]
     try:
-        return ast.literal_eval(raw)
+        colors = ast.literal_eval(raw)
     except (ValueError, SyntaxError):
-        return {}
+        colors = {}
+    _paint_colors_cache[key] = (raw, colors)
+    return colors
 
 
 def _get_triangle_set_counts(mesh):
@@ -145,26 +206,71 @@ def _get_triangle_set_counts(mesh):
     num_faces = len(mesh.polygons)
     if num_faces == 0:
         return {}
-    values = [0] * num_faces
+    values = np.empty(num_faces, dtype=np.int32)
     attr.data.foreach_get("value", values)
-    counts = {}
-    for v in values:
-        if v > 0:
-            counts[v] = counts.get(v, 0) + 1
+    values = values[values > 0]
+    if values.size == 0:
+        return {}
+    counts = np.bincount(values)
+    set_ids = np.flatnonzero(counts)
+    return dict(zip(set_ids.tolist(), counts[set_ids].tolist()))
+
+
+# Mesh pointer -> (raw names property, parsed names).  An entry is only
+# reused while the stored JSON string is unchanged.
+_triangle_set_names_cache = {}
+
+
+def _get_triangle_set_names(mesh):
+    """Return the triangle-set names stored on *mesh* (index 0 is set 1)."""
+    raw_names = mesh.get("3mf_triangle_set_names", "")
+    if not isinstance(raw_names, str):
+        # A list-valued property rather than a JSON string is used as-is.
+        return list(raw_names) if raw_names else []
+    if not raw_names:
+        return []
+    key = mesh.as_pointer()
+    cached = _triangle_set_names_cache.get(key)
+    if cached is not None and cached[0] == raw_names:
+        return cached[1]
+    try:
+        set_names = json.loads(raw_names)
+    except (json.JSONDecodeError, ValueError):
+        set_names = []
+    _triangle_set_names_cache[key] = (raw_names, set_names)
+    return set_names
+
+
+# Mesh pointer -> (face count, triangle-set counts) for the panel's redraws.
+# Cleared whenever a mesh is updated in the depsgraph and on file load.
+_triangle_set_cache = {}
+
+
+def _cached_triangle_set_counts(mesh):
+    """Return :func:`_get_triangle_set_counts` for *mesh*, reusing the last redraw's result."""
+    key = mesh.as_pointer()
+    num_faces = len(mesh.polygons)
+    cached = _triangle_set_cache.get(key)
+    if cached is not None and cached[0] == num_faces:
+        return cached[1]
+    counts = _get_triangle_set_counts(mesh)
+    _triangle_set_cache[key] = (num_faces, counts)
     return counts
 
 
-def _has_object_metadata(obj):
-    """Return ``True`` if *obj* has any 3MF metadata worth displaying."""
-    if obj.get("3mf:partnumber") is not None:
-        return True
-    for key in obj.keys():
-        if key.startswith("_"):
+def _object_metadata_entries(obj):
+    """Return ``[(key, value_str)]`` for the custom 3MF metadata on *obj*.
+
+    The part number and internal (``_``-prefixed) keys are left out.
+    """
+    entries = []
+    for key, entry in obj.items():
+        if key == "3mf:partnumber" or key.startswith("_"):
             continue
-        _, is_meta = _get_metadata_value(obj, key)
-        if is_meta:
-            return True
-    return False
+        value = _metadata_entry_value(entry)
+        if value is not None:
+            entries.append((key, value))
+    return entries
 
 
 def _format_count(n):
@@ -172,6 +278,24 @@ def _format_count(n):
     return f"{n:,}"
 
 
+def _label_split(parent, label):
+    """Add a ``label | value`` row to *parent*; return the split for the value side."""
+    split = parent.row(align=True).split(factor=0.35, align=True)
+    split.label(text=label)
+    return split
+
+
+def _kv_row(parent, label, value, enabled=True, icon="NONE"):
+    """Add a ``label | value`` row; *enabled* False greys out the value."""
+    split = _label_split(parent, label)
+    if enabled:
+        split.label(text=value, icon=icon)
+    else:
+        val_row = split.row()
+        val_row.enabled = False
+        val_row.label(text=value, icon=icon)
+
+
 # ===================================================================
 #  Operators
 # ===================================================================
@@ -199,7 +323,7 @@ class THREEMF_OT_edit_metadata(bpy.types.Operator):
         entry = scene.get(self.key)
         if self.key == "Title":
             self.value = scene.name
-        elif isinstance(entry, idprop.types.IDPropertyGroup):
+        elif isinstance(entry, _IDPropertyGroup):
             self.value = str(entry.get("value", ""))
         elif isinstance(entry, str):
             self.value = entry
@@ -298,7 +422,7 @@ class THREEMF_OT_remove_metadata(bpy.types.Operator):
 
     def execute(self, context):
         scene = context.scene
-        if self.key in scene.keys():
+        if self.key in scene:
             del scene[self.key]
             self.report({"INFO"}, f"Removed metadata: {self.key}")
         return {"FINISHED"}
@@ -366,26 +490,34 @@ class VIEW3D_PT_3mf_metadata(bpy.types.Panel):
         obj = context.active_object
         mesh = obj.data if (obj and obj.type == "MESH") else None
 
+        # One pass over the scene's ID properties serves every scene
+        # metadata lookup in this draw.
+        scene_props = dict(scene.items())
+
         # 1) Scene Metadata — always visible.
-        self._draw_scene_metadata(layout, scene)
+        self._draw_scene_metadata(layout, scene, scene_props)
 
         # 2) Object Info — mesh objects only.
         if mesh is not None:
             self._draw_object_info(layout, obj, mesh)
 
         # 3) Object Metadata — when the object carries 3MF metadata.
-        if obj is not None and _has_object_metadata(obj):
-            self._draw_object_metadata(layout, obj)
+        #    One walk of the object's properties both decides and fills it.
+        if obj is not None:
+            partnumber = obj.get("3mf:partnumber")
+            obj_entries = _object_metadata_entries(obj)
+            if partnumber is not None or obj_entries:
+                self._draw_object_metadata(layout, partnumber, obj_entries)
 
         # 4) MMU Paint — when paint-texture data exists on the mesh.
         if mesh is not None and mesh.get("3mf_is_paint_texture"):
             self._draw_mmu_paint(layout, mesh)
 
         # 5) Slicer Info — when slicer data or stashed configs detected.
-        vendor = _detect_vendor_from_scene(scene)
+        vendor = _detect_vendor_from_scene(scene, scene_props)
         stashed = _get_stashed_configs()
         if vendor or stashed:
-            self._draw_slicer_info(layout, scene, vendor, stashed)
+            self._draw_slicer_info(layout, scene_props, vendor, stashed)
 
         # 6) Materials — when the object has material slots.
         if obj is not None and len(obj.material_slots) > 0:
@@ -399,7 +531,7 @@ class VIEW3D_PT_3mf_metadata(bpy.types.Panel):
     #  Section: Scene Metadata
     # ---------------------------------------------------------------
 
-    def _draw_scene_metadata(self, layout, scene):
+    def _draw_scene_metadata(self, layout, scene, entries):
         header, body = layout.panel(
             "THREEMF_PT_meta_scene", default_closed=False,
         )
@@ -409,12 +541,9 @@ class VIEW3D_PT_3mf_metadata(bpy.types.Panel):
 
         # Editable fields.
         for key in _EDITABLE_KEYS:
-            value, _ = _get_metadata_value(scene, key)
-            row = body.row(align=True)
-            split = row.split(factor=0.35, align=True)
-
+            value, _ = _get_metadata_value(scene, key, entries)
             if value is not None:
-                split.label(text=f"{key}:")
+                split = _label_split(body, f"{key}:")
                 val_row = split.row(align=True)
                 val_row.label(text=value if value else "(empty)")
                 op = val_row.operator(
@@ -422,6 +551,7 @@ class VIEW3D_PT_3mf_metadata(bpy.types.Panel):
                 )
                 op.key = key
             else:
+                split = body.row(align=True).split(factor=0.35, align=True)
                 lbl = split.row()
                 lbl.enabled = False
                 lbl.label(text=f"{key}:")
@@ -435,33 +565,26 @@ class VIEW3D_PT_3mf_metadata(bpy.types.Panel):
         # Read-only date fields.
         has_readonly = False
         for key in _SCENE_READONLY_KEYS:
-            value, _ = _get_metadata_value(scene, key)
+            value = _metadata_entry_value(entries.get(key))
             if value is not None:
                 if not has_readonly:
                     body.separator()
                     has_readonly = True
-                row = body.row(align=True)
-                split = row.split(factor=0.35, align=True)
-                split.label(text=f"{key}:")
-                val_row = split.row()
-                val_row.enabled = False
-                val_row.label(text=value)
+                _kv_row(body, f"{key}:", value, enabled=False)
 
         # Custom metadata entries (not standard, not slicer, not internal).
         custom_keys = []
-        for key in scene.keys():
+        for key, entry in entries.items():
             if key in _STANDARD_KEYS or key.startswith("_") or key.startswith("3mf_"):
                 continue
-            value, is_meta = _get_metadata_value(scene, key)
-            if is_meta:
+            value = _metadata_entry_value(entry)
+            if value is not None:
                 custom_keys.append((key, value))
 
         if custom_keys:
             body.separator()
             for key, value in custom_keys:
-                row = body.row(align=True)
-                split = row.split(factor=0.35, align=True)
-                split.label(text=f"{key}:")
+                split = _label_split(body, f"{key}:")
                 val_row = split.row(align=True)
                 val_row.label(text=value if value else "(empty)")
                 op = val_row.operator(
@@ -490,32 +613,15 @@ class VIEW3D_PT_3mf_metadata(bpy.types.Panel):
 
         col = body.column(align=True)
 
-        row = col.row(align=True)
-        split = row.split(factor=0.35, align=True)
-        split.label(text="Name:")
-        split.label(text=obj.name)
-
-        row = col.row(align=True)
-        split = row.split(factor=0.35, align=True)
-        split.label(text="Vertices:")
-        split.label(text=_format_count(len(mesh.vertices)))
-
-        row = col.row(align=True)
-        split = row.split(factor=0.35, align=True)
-        split.label(text="Faces:")
-        split.label(text=_format_count(len(mesh.polygons)))
-
+        _kv_row(col, "Name:", obj.name)
+        _kv_row(col, "Vertices:", _format_count(len(mesh.vertices)))
+        _kv_row(col, "Faces:", _format_count(len(mesh.polygons)))
         dims = obj.dimensions
-        row = col.row(align=True)
-        split = row.split(factor=0.35, align=True)
-        split.label(text="Dimensions:")
-        split.label(text=f"{dims.x:.4g} \u00d7 {dims.y:.4g} \u00d7 {dims.z:.4g}")
+        _kv_row(col, "Dimensions:", f"{dims.x:.4g} \u00d7 {dims.y:.4g} \u00d7 {dims.z:.4g}")
 
         # Part subtype (Orca/BambuStudio modifier system).
         current_subtype = obj.get("3mf_part_subtype", "normal_part")
-        row = col.row(align=True)
-        split = row.split(factor=0.35, align=True)
-        split.label(text="Part Type:")
+        split = _label_split(col, "Part Type:")
         split.operator_menu_enum(
             "threemf.set_part_subtype",
             "subtype",
@@ -527,7 +633,7 @@ class VIEW3D_PT_3mf_metadata(bpy.types.Panel):
     #  Section: Object Metadata
     # ---------------------------------------------------------------
 
-    def _draw_object_metadata(self, layout, obj):
+    def _draw_object_metadata(self, layout, partnumber, entries):
         header, body = layout.panel(
             "THREEMF_PT_meta_obj_meta", default_closed=False,
         )
@@ -537,24 +643,11 @@ class VIEW3D_PT_3mf_metadata(bpy.types.Panel):
 
         col = body.column(align=True)
 
-        partnumber = obj.get("3mf:partnumber")
         if partnumber is not None:
-            row = col.row(align=True)
-            split = row.split(factor=0.35, align=True)
-            split.label(text="Part Number:")
-            split.label(text=str(partnumber))
+            _kv_row(col, "Part Number:", str(partnumber))
 
-        for key in obj.keys():
-            if key == "3mf:partnumber" or key.startswith("_"):
-                continue
-            value, is_meta = _get_metadata_value(obj, key)
-            if is_meta:
-                row = col.row(align=True)
-                split = row.split(factor=0.35, align=True)
-                split.label(text=f"{key}:")
-                val_row = split.row()
-                val_row.enabled = False
-                val_row.label(text=value if value else "(empty)")
+        for key, value in entries:
+            _kv_row(col, f"{key}:", value if value else "(empty)", enabled=False)
 
     # ---------------------------------------------------------------
     #  Section: MMU Paint
@@ -570,37 +663,25 @@ class VIEW3D_PT_3mf_metadata(bpy.types.Panel):
 
         col = body.column(align=True)
 
-        row = col.row(align=True)
-        split = row.split(factor=0.35, align=True)
-        split.label(text="Status:")
-        split.label(text="Active", icon="CHECKMARK")
+        _kv_row(col, "Status:", "Active", icon="CHECKMARK")
 
         default_ext = mesh.get("3mf_paint_default_extruder", 0)
         if default_ext:
-            row = col.row(align=True)
-            split = row.split(factor=0.35, align=True)
-            split.label(text="Default Extruder:")
-            split.label(text=str(default_ext))
+            _kv_row(col, "Default Extruder:", str(default_ext))
 
         colors = _parse_paint_colors(mesh)
         if colors:
-            row = col.row(align=True)
-            split = row.split(factor=0.35, align=True)
-            split.label(text="Filaments:")
-            split.label(text=str(len(colors)))
+            _kv_row(col, "Filaments:", str(len(colors)))
 
             col.separator()
-            for idx in sorted(colors.keys()):
-                row = col.row(align=True)
-                split = row.split(factor=0.35, align=True)
-                split.label(text=f"  Filament {idx}:")
-                split.label(text=colors[idx])
+            for idx, hex_color in sorted(colors.items()):
+                _kv_row(col, f"  Filament {idx}:", hex_color)
 
     # ---------------------------------------------------------------
     #  Section: Slicer Info
     # ---------------------------------------------------------------
 
-    def _draw_slicer_info(self, layout, scene, vendor, stashed):
+    def _draw_slicer_info(self, layout, scene_props, vendor, stashed):
         header, body = layout.panel(
             "THREEMF_PT_meta_slicer", default_closed=True,
         )
@@ -611,42 +692,28 @@ class VIEW3D_PT_3mf_metadata(bpy.types.Panel):
         col = body.column(align=True)
 
         if vendor:
-            row = col.row(align=True)
-            split = row.split(factor=0.35, align=True)
-            split.label(text="Source:")
-            split.label(text=vendor)
+            _kv_row(col, "Source:", vendor)
 
-        app_value, _ = _get_metadata_value(scene, "Application")
+        app_value = _metadata_entry_value(scene_props.get("Application"))
         if app_value:
-            row = col.row(align=True)
-            split = row.split(factor=0.35, align=True)
-            split.label(text="Application:")
-            val_row = split.row()
-            val_row.enabled = False
-            val_row.label(text=app_value)
+            _kv_row(col, "Application:", app_value, enabled=False)
 
-        bambu_ver, _ = _get_metadata_value(scene, "BambuStudio:3mfVersion")
+        bambu_ver = _metadata_entry_value(scene_props.get("BambuStudio:3mfVersion"))
         if bambu_ver is not None:
-            row = col.row(align=True)
-            split = row.split(factor=0.35, align=True)
-            split.label(text="3MF Version:")
-            val_row = split.row()
-            val_row.enabled = False
-            val_row.label(text=bambu_ver)
+            _kv_row(col, "3MF Version:", bambu_ver, enabled=False)
 
         if stashed:
             col.separator()
-            row = col.row(align=True)
-            split = row.split(factor=0.35, align=True)
-            split.label(text="Stashed Configs:")
+            split = _label_split(col, "Stashed Configs:")
             count = len(stashed)
             split.label(text=f"{count} file{'s' if count != 1 else ''}")
 
             info = col.column(align=True)
             info.scale_y = 0.7
+            info_label = info.label
+            prefix_len = len(_CONFIG_STASH_PREFIX)
             for name in stashed:
-                display = name[len(_CONFIG_STASH_PREFIX):]
-                info.label(text=f"  {display}", icon="DOT")
+                info_label(text=f"  {name[prefix_len:]}", icon="DOT")
 
     # ---------------------------------------------------------------
     #  Section: Materials
@@ -674,15 +741,7 @@ class VIEW3D_PT_3mf_metadata(bpy.types.Panel):
     # ---------------------------------------------------------------
 
     def _draw_triangle_sets(self, layout, mesh):
-        import json
-        raw_names = mesh.get("3mf_triangle_set_names", "")
-        if isinstance(raw_names, str) and raw_names:
-            try:
-                set_names = json.loads(raw_names)
-            except (json.JSONDecodeError, ValueError):
-                set_names = []
-        else:
-            set_names = list(raw_names) if raw_names else []
+        set_names = _get_triangle_set_names(mesh)
         if not set_names:
             return
 
@@ -693,7 +752,7 @@ class VIEW3D_PT_3mf_metadata(bpy.types.Panel):
         if body is None:
             return
 
-        counts = _get_triangle_set_counts(mesh)
+        counts = _cached_triangle_set_counts(mesh)
         col = body.column(align=True)
         for i, name in enumerate(set_names, start=1):
             face_count = counts.get(i, 0)
@@ -705,6 +764,30 @@ class VIEW3D_PT_3mf_metadata(bpy.types.Panel):
             sub.label(text=f"{_format_count(face_count)} faces")
 
 
+# ===================================================================
+#  Cache invalidation
+# ===================================================================
+
+@bpy.app.handlers.persistent
+def _invalidate_caches(*_args):
+    """``load_post`` handler: forget every cached scan."""
+    global _stashed_cache
+    _stashed_cache = None
+    _triangle_set_cache.clear()
+    _paint_colors_cache.clear()
+    _vendor_cache.clear()
+    _triangle_set_names_cache.clear()
+
+
+@bpy.app.handlers.persistent
+def _on_depsgraph_update(scene, depsgraph=None):
+    """Drop the stashed-config scan, and triangle-set counts once meshes change."""
+    global _stashed_cache
+    _stashed_cache = None
+    if depsgraph is None or depsgraph.id_type_updated("MESH"):
+        _triangle_set_cache.clear()
+
+
 # ===================================================================
 #  Registration
 # ===================================================================
@@ -721,8 +804,15 @@ _metadata_classes = (
 def register():
     for cls in _metadata_classes:
         bpy.utils.register_class(cls)
+    bpy.app.handlers.depsgraph_update_post.append(_on_depsgraph_update)
+    bpy.app.handlers.load_post.append(_invalidate_caches)
 
 
 def unregister():
+    if _on_depsgraph_update in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(_on_depsgraph_update)
+    if _invalidate_caches in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(_invalidate_caches)
+    _invalidate_caches()
     for cls in reversed(_metadata_classes):
         bpy.utils.unregister_class(cls)
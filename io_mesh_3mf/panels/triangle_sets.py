@@ -25,6 +25,7 @@ starting at 1).
 import bpy
 import bpy.props
 import bpy.types
+import numpy as np
 
 
 # ===================================================================
@@ -43,13 +44,12 @@ def _get_face_set_info(mesh):
     num_faces = len(mesh.polygons)
     if num_faces == 0:
         return {}
-    values = [0] * num_faces
+    values = np.empty(num_faces, dtype=np.int32)
     attr.data.foreach_get("value", values)
-    counts = {}
-    for v in values:
-        if v > 0:
-            counts[v] = counts.get(v, 0) + 1
-    return counts
+    # Sculpt face-set IDs are not guaranteed to be small, so count with
+    # np.unique rather than a bincount sized by the largest ID.
+    set_ids, counts = np.unique(values[values > 0], return_counts=True)
+    return dict(zip(set_ids.tolist(), counts.tolist()))
 
 
 def _load_set_names(mesh):
@@ -227,11 +227,4 @@ _triangle_set_classes = (
 )
 
 
-def register():
-    for cls in _triangle_set_classes:
-        bpy.utils.register_class(cls)
-
-
-def unregister():
-    for cls in reversed(_triangle_set_classes):
-        bpy.utils.unregister_class(cls)
+register, unregister = bpy.utils.register_classes_factory(_triangle_set_classes)
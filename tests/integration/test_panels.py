@@ -207,6 +207,17 @@ class GetTriangleSetCountsTests(Blender3mfTestCase):
         self.assertIn(2, result)
         self.assertEqual(result[1] + result[2], num_faces)
 
+    def test_unassigned_faces_and_gaps(self):
+        """Faces with set 0 are skipped and unused set indices are absent."""
+        bpy.ops.mesh.primitive_cube_add()
+        mesh = bpy.context.object.data
+
+        attr = mesh.attributes.new(name="3mf_triangle_set", type="INT", domain="FACE")
+        attr.data.foreach_set("value", [0, 3, 3, 0, 1, 3])
+
+        result = self._get_triangle_set_counts(mesh)
+        self.assertEqual(result, {1: 1, 3: 3})
+
 
 # ===========================================================================
 #  Triangle sets panel helpers
@@ -0,0 +1,59 @@
+"""
+Unit tests for colorgroup parsing in ``io_mesh_3mf.import_3mf.materials.base``.
+
+Covers ``_read_colorgroups`` on hand-built XML, using a minimal stand-in
+for the Import3MF operator's resource dictionaries.
+"""
+
+import types
+import unittest
+import xml.etree.ElementTree as ET
+
+from io_mesh_3mf.common.constants import MATERIAL_NAMESPACE, MODEL_NAMESPACE
+from io_mesh_3mf.import_3mf.materials.base import _read_colorgroups
+
+
+def _make_op():
+    return types.SimpleNamespace(
+        resource_materials={},
+        resource_colorgroups={},
+        vendor_format=None,
+        safe_report=lambda level, msg: None,
+    )
+
+
+def _colorgroup_root(colors):
+    color_xml = "".join(f'<m:color color="{c}"/>' for c in colors)
+    return ET.fromstring(
+        f'<model xmlns="{MODEL_NAMESPACE}" xmlns:m="{MATERIAL_NAMESPACE}">'
+        f'<resources><m:colorgroup id="1">{color_xml}</m:colorgroup></resources>'
+        f"</model>"
+    )
+
+
+class ReadColorgroupsTests(unittest.TestCase):
+    """Tests for _read_colorgroups()."""
+
+    def _read(self, colors):
+        op = _make_op()
+        _read_colorgroups(op, _colorgroup_root(colors), {"m": MATERIAL_NAMESPACE}, {})
+        return op
+
+    def test_valid_colors(self):
+        """Six- and eight-digit colors each become a material."""
+        op = self._read(["#FF0000", "#00FF0080"])
+        materials = op.resource_materials["1"]
+        self.assertEqual(len(materials), 2)
+        self.assertAlmostEqual(materials[0].color[0], 1.0)
+        self.assertAlmostEqual(materials[1].color[3], 128 / 255)
+
+    def test_embedded_whitespace_color_is_skipped(self):
+        """A color whose hex digits contain whitespace is skipped, not fatal."""
+        op = self._read(["#ff ff ", "#0000FF"])
+        materials = op.resource_materials["1"]
+        self.assertEqual(len(materials), 1)
+        self.assertAlmostEqual(materials[0].color[2], 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
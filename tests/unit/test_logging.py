@@ -10,7 +10,7 @@ import unittest
 from unittest.mock import patch
 
 import io_mesh_3mf.common.logging as log_mod
-from io_mesh_3mf.common.logging import debug, warn, error, safe_report
+from io_mesh_3mf.common.logging import debug, debug_enabled, warn, error, safe_report
 
 
 # ============================================================================
@@ -52,6 +52,27 @@ class TestDebug(unittest.TestCase):
             log_mod.DEBUG_MODE = original
 
 
+class TestDebugEnabled(unittest.TestCase):
+    """debug_enabled() should mirror the gating used by debug()."""
+
+    def test_true_when_debug_mode(self):
+        original = log_mod.DEBUG_MODE
+        try:
+            log_mod.DEBUG_MODE = True
+            self.assertTrue(debug_enabled())
+        finally:
+            log_mod.DEBUG_MODE = original
+
+    def test_false_when_disabled(self):
+        original = log_mod.DEBUG_MODE
+        try:
+            log_mod.DEBUG_MODE = False
+            with patch.object(log_mod, "_is_blender_debug", return_value=False):
+                self.assertFalse(debug_enabled())
+        finally:
+            log_mod.DEBUG_MODE = original
+
+
 # ============================================================================
 # warn()
 # ============================================================================
@@ -5,7 +5,8 @@ Covers pure/numpy functions from:
 - ``io_mesh_3mf.paint.quantize`` — _rgb_to_hsv, _hue_aware_distance, _quantize_pixels, etc.
 - ``io_mesh_3mf.paint.bake`` — _get_texture_size
 - ``io_mesh_3mf.paint.color_detection`` — _deduplicate_colors, _srgb_to_hsv_array,
-    _bin_pixels_hsv, _hs_distance, _select_diverse_colors, _linear_to_srgb_array
+    _bin_pixels_hsv, _accumulate_histogram, _histogram_means, _hs_distance_sq,
+    _select_diverse_colors, _linear_to_srgb_array
 - ``io_mesh_3mf.paint.helpers`` — DEFAULT_PALETTE, _layer_colors, _layer_uv_name,
     _layer_flag_key, _layer_colors_key
 """
@@ -395,6 +396,16 @@ class DeduplicateColorsTests(unittest.TestCase):
         result = self._deduplicate_colors(colors, tolerance=0.02)
         self.assertEqual(len(result), 1)
 
+    def test_merges_within_tolerance_regardless_of_position(self):
+        """Colors closer than tolerance merge wherever they fall."""
+        for colors in (
+            [(0.5099, 0.2, 0.2), (0.5101, 0.2, 0.2)],
+            [(0.50, 0.2, 0.2), (0.515, 0.2, 0.2)],
+        ):
+            with self.subTest(colors=colors):
+                result = self._deduplicate_colors(colors, tolerance=0.02)
+                self.assertEqual(result, [colors[0]])
+
 
 class SrgbToHsvArrayTests(unittest.TestCase):
     """Tests for paint.color_detection._srgb_to_hsv_array()."""
@@ -430,7 +441,7 @@ class BinPixelsHsvTests(unittest.TestCase):
     def test_single_color(self):
         """A single uniform color produces one bin."""
         srgb = np.full((100, 3), [1.0, 0.0, 0.0], dtype=np.float32)
-        colors, counts = self._bin_pixels_hsv(srgb)
+        colors, _hsv, counts = self._bin_pixels_hsv(srgb)
         self.assertGreaterEqual(len(colors), 1)
         self.assertEqual(int(counts[0]), 100)
 
@@ -439,13 +450,13 @@ class BinPixelsHsvTests(unittest.TestCase):
         srgb = np.zeros((200, 3), dtype=np.float32)
         srgb[:100] = [1.0, 0.0, 0.0]  # red
         srgb[100:] = [0.0, 0.0, 1.0]  # blue
-        colors, counts = self._bin_pixels_hsv(srgb)
+        colors, _hsv, counts = self._bin_pixels_hsv(srgb)
         self.assertGreaterEqual(len(colors), 2)
 
     def test_grey_pixels_binned(self):
         """Achromatic (grey) pixels still produce bins."""
         srgb = np.full((50, 3), [0.5, 0.5, 0.5], dtype=np.float32)
-        colors, counts = self._bin_pixels_hsv(srgb)
+        colors, _hsv, counts = self._bin_pixels_hsv(srgb)
         self.assertGreaterEqual(len(colors), 1)
 
     def test_sorted_descending_by_count(self):
@@ -453,10 +464,78 @@ class BinPixelsHsvTests(unittest.TestCase):
         srgb = np.zeros((300, 3), dtype=np.float32)
         srgb[:200] = [1.0, 0.0, 0.0]  # 200 red
         srgb[200:] = [0.0, 1.0, 0.0]  # 100 green
-        colors, counts = self._bin_pixels_hsv(srgb)
+        colors, _hsv, counts = self._bin_pixels_hsv(srgb)
         for i in range(len(counts) - 1):
             self.assertGreaterEqual(int(counts[i]), int(counts[i + 1]))
 
+    def test_returns_bin_hsv(self):
+        """The returned HSV rows are the HSV of the returned sRGB colors."""
+        from io_mesh_3mf.paint.color_detection import _srgb_to_hsv_array
+
+        srgb = np.random.default_rng(0).random((500, 3)).astype(np.float32)
+        colors, hsv, counts = self._bin_pixels_hsv(srgb)
+        self.assertEqual(hsv.shape, colors.shape)
+        np.testing.assert_allclose(hsv, _srgb_to_hsv_array(colors))
+
+    def test_weighted_counts(self):
+        """Per-row weights are summed into the bin counts."""
+        srgb = np.array([[1.0, 0.0, 0.0], [0.0, 0.0, 1.0]], dtype=np.float32)
+        colors, _hsv, counts = self._bin_pixels_hsv(srgb, np.array([3, 7]))
+        self.assertEqual([int(c) for c in counts], [7, 3])
+        np.testing.assert_allclose(colors[0], [0.0, 0.0, 1.0])
+
+
+class HistogramTests(unittest.TestCase):
+    """Tests for paint.color_detection._accumulate_histogram() / _histogram_means()."""
+
+    def setUp(self):
+        from io_mesh_3mf.paint.color_detection import (
+            _HISTOGRAM_BITS,
+            _HISTOGRAM_CHUNK,
+            _accumulate_histogram,
+            _histogram_means,
+        )
+
+        self._chunk = _HISTOGRAM_CHUNK
+        self._accumulate_histogram = _accumulate_histogram
+        self._histogram_means = _histogram_means
+        self._cells = 1 << (3 * _HISTOGRAM_BITS)
+
+    def _histogram(self, srgb, chunk):
+        """Stream *srgb* into a fresh histogram in blocks of *chunk* rows."""
+        counts = np.zeros(self._cells, dtype=np.int64)
+        sums = np.zeros((self._cells, 3), dtype=np.float64)
+        for start in range(0, len(srgb), chunk):
+            self._accumulate_histogram(counts, sums, srgb[start:start + chunk])
+        return self._histogram_means(counts, sums)
+
+    def test_collapses_identical_pixels(self):
+        """Identical pixels land in one cell whose weight is their count."""
+        srgb = np.full((100, 3), [1.0, 0.0, 0.0], dtype=np.float32)
+        means, weights = self._histogram(srgb, self._chunk)
+        self.assertEqual(len(means), 1)
+        self.assertEqual(int(weights[0]), 100)
+        np.testing.assert_allclose(means[0], [1.0, 0.0, 0.0])
+
+    def test_cells_report_mean_color(self):
+        """A cell is represented by the mean of its pixels, not its center."""
+        color = np.array([200, 30, 90], dtype=np.float32) / 255
+        srgb = np.tile(color, (10, 1))
+        means, weights = self._histogram(srgb, self._chunk)
+        self.assertEqual(len(means), 1)
+        np.testing.assert_allclose(means[0], color, atol=1e-6)
+
+    def test_blocks_match_single_pass(self):
+        """Streaming more rows than one block gives the single-pass result."""
+        rows = self._chunk + self._chunk // 2
+        srgb = np.random.default_rng(0).random((rows, 3)).astype(np.float32)
+        means, weights = self._histogram(srgb, self._chunk)
+        whole_means, whole_weights = self._histogram(srgb, rows)
+        self.assertEqual(int(weights.sum()), rows)
+        self.assertLessEqual(len(means), self._cells)
+        np.testing.assert_array_equal(weights, whole_weights)
+        np.testing.assert_allclose(means, whole_means, atol=1e-6)
+
 
 class SelectDiverseColorsTests(unittest.TestCase):
     """Tests for paint.color_detection._select_diverse_colors()."""
@@ -535,27 +614,34 @@ class LinearToSrgbArrayTests(unittest.TestCase):
         self.assertGreater(float(result[0, 0]), 0.7)
         self.assertLess(float(result[0, 0]), 0.8)
 
+    def test_lookup_matches_exact_curve(self):
+        """The lookup table stays within 2e-3 of the exact transfer curve."""
+        rgb = np.linspace(0.0, 1.0, 3000, dtype=np.float32).reshape(-1, 3)
+        fast = self._linear_to_srgb_array(rgb)
+        exact = self._linear_to_srgb_array(rgb, exact=True)
+        self.assertLess(float(np.abs(fast - exact).max()), 2e-3)
+
 
-class HsDistanceTests(unittest.TestCase):
-    """Tests for paint.color_detection._hs_distance()."""
+class HsDistanceSqTests(unittest.TestCase):
+    """Tests for paint.color_detection._hs_distance_sq()."""
 
     def setUp(self):
-        from io_mesh_3mf.paint.color_detection import _hs_distance
+        from io_mesh_3mf.paint.color_detection import _hs_distance_sq
 
-        self._hs_distance = _hs_distance
+        self._hs_distance_sq = _hs_distance_sq
 
     def test_identical_zero_distance(self):
         """Same colors have zero distance."""
         a = np.array([[1.0, 0.0, 0.0]], dtype=np.float32)
         b = np.array([1.0, 0.0, 0.0], dtype=np.float32)
-        dist = self._hs_distance(a, b)
+        dist = self._hs_distance_sq(a, b)
         self.assertAlmostEqual(float(dist[0]), 0.0, places=3)
 
     def test_complementary_large_distance(self):
         """Complementary hues (red vs cyan) have large distance."""
         a = np.array([[1.0, 0.0, 0.0]], dtype=np.float32)
         b = np.array([0.0, 1.0, 1.0], dtype=np.float32)
-        dist = self._hs_distance(a, b)
+        dist = self._hs_distance_sq(a, b)
         self.assertGreater(float(dist[0]), 1.0)
 
 
@@ -651,6 +737,57 @@ class LayerHelpersTests(unittest.TestCase):
         self.assertEqual(_layer_colors_key("COLOR"), "3mf_paint_extruder_colors")
 
 
+class ColorMatchMaskTests(unittest.TestCase):
+    """Tests for paint.helpers._color_match_mask."""
+
+    def test_matches_full_difference_reference(self):
+        from io_mesh_3mf.paint.helpers import _color_match_mask, COLOR_MATCH_TOLERANCE
+
+        rng = np.random.default_rng(3)
+        levels = rng.integers(220, 240, size=(32, 48, 4))
+        pixels = (levels / 255.0).astype(np.float32)
+        rgb = (0.9, 0.88, 0.91)
+        expected = np.all(
+            np.abs(pixels[:, :, :3] - np.array(rgb, dtype=np.float32)) < COLOR_MATCH_TOLERANCE,
+            axis=2,
+        )
+        np.testing.assert_array_equal(_color_match_mask(pixels, rgb), expected)
+
+    def test_ignores_alpha(self):
+        from io_mesh_3mf.paint.helpers import _color_match_mask
+
+        pixels = np.zeros((2, 2, 4), dtype=np.float32)
+        pixels[..., 3] = [[0.0, 1.0], [0.5, 0.25]]
+        self.assertTrue(_color_match_mask(pixels, (0.0, 0.0, 0.0)).all())
+
+
+class ReplaceColorTests(unittest.TestCase):
+    """Tests for paint.helpers._replace_color."""
+
+    def test_matches_whole_canvas_replacement(self):
+        from io_mesh_3mf.paint.helpers import _color_match_mask, _replace_color
+
+        rng = np.random.default_rng(4)
+        levels = rng.integers(220, 240, size=(300, 400, 4))
+        pixels = (levels / 255.0).astype(np.float32)
+        old_rgb, new_rgb = (0.9, 0.88, 0.91), (0.1, 0.2, 0.3)
+
+        expected = pixels.copy()
+        mask = _color_match_mask(expected, old_rgb)
+        expected[mask, :3] = np.array(new_rgb, dtype=np.float32)
+
+        changed = _replace_color(pixels, old_rgb, new_rgb)
+        self.assertEqual(changed, int(np.count_nonzero(mask)))
+        np.testing.assert_array_equal(pixels, expected)
+
+    def test_no_match_leaves_pixels(self):
+        from io_mesh_3mf.paint.helpers import _replace_color
+
+        pixels = np.full((8, 8, 4), 0.5, dtype=np.float32)
+        self.assertEqual(_replace_color(pixels, (0.0, 0.0, 0.0), (1.0, 1.0, 1.0)), 0)
+        self.assertTrue(np.all(pixels == 0.5))
+
+
 # ===========================================================================
 #  Region-Based Quantization tests
 # ===========================================================================